@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import functools
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from .paths import is_racy, stat_identity
 from .pep723 import Pep723ScriptMetadata, parse_pep723_script
 
 
@@ -95,71 +98,108 @@ def _read_pep723_header(script_path: Path, *, max_lines: int = 200) -> Pep723Scr
                 if not line:
                     break
                 lines.append(line)
-                if line.lstrip().rstrip() == "# ///":
+                if line.strip() == "# ///":
                     break
         return parse_pep723_script("".join(lines))
     except Exception:
         return None
 
 
+# Parsed metadata is memoized by file identity so repeated scans (one per sync
+# target) only re-read files that changed; racy files are always re-read.
+def _file_identity(path: Path) -> tuple[int, ...] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return None if is_racy(st) else stat_identity(st)
+
+
+@functools.lru_cache(maxsize=4096)
+def _skill_meta_by_identity(skill_md: str, dirname: str, identity: tuple[int, ...]) -> tuple[str, str, str] | None:
+    return _read_skill_meta(Path(skill_md), dirname)
+
+
+def _read_skill_meta(skill_md: Path, dirname: str) -> tuple[str, str, str] | None:
+    try:
+        text = skill_md.read_text(encoding="utf-8")
+    except Exception:
+        return None
+    fm = _read_yaml_frontmatter(text)
+    sid = str((fm.get("id") or dirname)).strip()
+    title = str((fm.get("name") or sid)).strip()
+    desc = str((fm.get("description") or "")).strip()
+    return sid, title, desc
+
+
+@functools.lru_cache(maxsize=4096)
+def _pep723_by_identity(script_path: str, identity: tuple[int, ...]) -> Pep723ScriptMetadata | None:
+    return _read_pep723_header(Path(script_path))
+
+
+def _scandir_sorted(path: Path) -> list[os.DirEntry[str]]:
+    # One directory read; DirEntry caches the type so filtering needs no extra stats.
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    entries.sort(key=lambda e: e.name)
+    return entries
+
+
 def scan_assets(root: Path) -> AssetIndex:
     skills: list[SkillAsset] = []
     commands: list[CommandAsset] = []
     agents: list[AgentAsset] = []
 
-    skills_dir = root / "skills"
-    if skills_dir.exists():
-        for d in sorted(skills_dir.iterdir()):
-            if not d.is_dir() or d.name.startswith("."):
-                continue
-            skill_md = d / "SKILL.md"
-            if not skill_md.exists():
-                continue
-            try:
-                text = skill_md.read_text(encoding="utf-8")
-            except Exception:
-                continue
-            fm = _read_yaml_frontmatter(text)
-            sid = str((fm.get("id") or d.name)).strip()
-            title = str((fm.get("name") or sid)).strip()
-            desc = str((fm.get("description") or "")).strip()
-
-            scripts: list[ScriptAsset] = []
-            scripts_dir = d / "scripts"
-            if scripts_dir.exists() and scripts_dir.is_dir():
-                for sp in sorted(scripts_dir.rglob("*.py")):
-                    meta = _read_pep723_header(sp)
-                    scripts.append(
-                        ScriptAsset(
-                            path=str(sp),
-                            runtime="python",
-                            runner="uv" if meta else None,
-                            pep723=meta,
-                        )
+    for d in _scandir_sorted(root / "skills"):
+        if d.name.startswith(".") or not d.is_dir():
+            continue
+        skill_md = Path(d.path) / "SKILL.md"
+        if not skill_md.exists():
+            continue
+        ident = _file_identity(skill_md)
+        meta = (
+            _read_skill_meta(skill_md, d.name)
+            if ident is None
+            else _skill_meta_by_identity(str(skill_md), d.name, ident)
+        )
+        if meta is None:
+            continue
+        sid, title, desc = meta
+
+        scripts: list[ScriptAsset] = []
+        scripts_dir = skill_md.parent / "scripts"
+        if scripts_dir.is_dir():
+            for sp in sorted(scripts_dir.rglob("*.py")):
+                ident = _file_identity(sp)
+                pep = _read_pep723_header(sp) if ident is None else _pep723_by_identity(str(sp), ident)
+                scripts.append(
+                    ScriptAsset(
+                        path=str(sp),
+                        runtime="python",
+                        runner="uv" if pep else None,
+                        pep723=pep,
                     )
-
-            skills.append(
-                SkillAsset(
-                    id=sid,
-                    title=title,
-                    description=desc,
-                    path=str(skill_md),
-                    scripts=tuple(scripts),
                 )
+
+        skills.append(
+            SkillAsset(
+                id=sid,
+                title=title,
+                description=desc,
+                path=str(skill_md),
+                scripts=tuple(scripts),
             )
+        )
+
+    for e in _scandir_sorted(root / "commands"):
+        if e.name.endswith(".md") and not e.name.startswith("."):
+            commands.append(CommandAsset(id=e.name[:-3], path=e.path))
 
-    commands_dir = root / "commands"
-    if commands_dir.exists():
-        for p in sorted(commands_dir.glob("*.md")):
-            if p.name.startswith("."):
-                continue
-            commands.append(CommandAsset(id=p.stem, path=str(p)))
-
-    agents_dir = root / "agents"
-    if agents_dir.exists():
-        for p in sorted(agents_dir.glob("*.md")):
-            if p.name.startswith("."):
-                continue
-            agents.append(AgentAsset(id=p.stem, path=str(p)))
+    for e in _scandir_sorted(root / "agents"):
+        if e.name.endswith(".md") and not e.name.startswith("."):
+            agents.append(AgentAsset(id=e.name[:-3], path=e.path))
 
     return AssetIndex(skills=tuple(skills), commands=tuple(commands), agents=tuple(agents))
@@ -7,6 +7,7 @@ from pathlib import Path
 from .assets import scan_assets
 from .config import botyard_manifest_path, parse_botyard_toml_file
 from .errors import BotyardConfigError
+from .store import sha256_is_accelerated
 
 
 @dataclass(frozen=True)
@@ -34,6 +35,8 @@ def run_doctor(*, manifest_path: Path | None = None) -> DoctorResult:
     needs_uv = any(s.pep723 is not None for sk in idx.skills for s in sk.scripts)
 
     warnings: list[str] = []
+    if not sha256_is_accelerated():
+        warnings.append("hashlib SHA-256 is not OpenSSL-backed; hashing and sync will be slow.")
     if needs_uv and shutil.which("uv") is None:
         warnings.append("Detected PEP 723 script metadata but 'uv' is not installed.")
 
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import errno
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+try:  # Optional: faster JSON parsing and serialization.
+    import orjson as _orjson  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover (optional dependency)
+    _orjson = None
+
+
+def loads_json(raw: bytes) -> Any:
+    """Parse JSON bytes (orjson when installed)."""
+
+    if _orjson is not None:
+        try:
+            return _orjson.loads(raw)
+        except _orjson.JSONDecodeError:
+            pass  # e.g. NaN or huge ints: let the stdlib accept or report it
+    return json.loads(raw)
+
+
+def dump_json_bytes(obj: object) -> bytes:
+    """Pretty, key-sorted JSON as UTF-8 bytes (orjson when installed)."""
+
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_SORT_KEYS | _orjson.OPT_INDENT_2) + b"\n"
+    return (json.dumps(obj, sort_keys=True, indent=2) + "\n").encode("utf-8")
+
+
+# Linux: new files are written to an unnamed inode (O_TMPFILE) and linked in once
+# complete, so a crash never strands a `.tmp` sibling. linkat() can't replace an
+# existing name, so rewrites keep the tmp + rename path.
+_O_TMPFILE = getattr(os, "O_TMPFILE", None)
+# Cleared the first time linkat() via /proc/self/fd is refused (no /proc, sandboxed
+# linkat, ...) so later writes don't fill an unnamed inode only to redo the work.
+_link_tmpfile_ok = True
+_LINK_UNSUPPORTED = frozenset({errno.EXDEV, errno.ENOENT, errno.EPERM})
+
+
+def write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def publish_anonymous(dst: Path, fill: Callable[[int], None]) -> bool:
+    """Write a new `dst` via O_TMPFILE + linkat. Returns False to request the fallback."""
+
+    global _link_tmpfile_ok
+    if _O_TMPFILE is None or not _link_tmpfile_ok or os.path.lexists(dst):
+        return False
+    try:
+        fd = os.open(dst.parent, _O_TMPFILE | os.O_WRONLY, 0o666)
+    except OSError:  # e.g. EOPNOTSUPP/EISDIR on filesystems without O_TMPFILE
+        return False
+    try:
+        fill(fd)
+        try:
+            os.link(f"/proc/self/fd/{fd}", dst, follow_symlinks=True)
+        except OSError as e:
+            if e.errno in _LINK_UNSUPPORTED:
+                _link_tmpfile_ok = False
+            raise
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+    return True
+
+
+def atomic_write_bytes(dst: Path, data: bytes) -> None:
+    """Replace `dst` with `data` so readers never observe a partial file."""
+
+    if publish_anonymous(dst, lambda fd: write_all(fd, data)):
+        return
+    # Raw fd write + rename: no text-layer encoder or newline translation.
+    tmp = os.path.join(dst.parent, dst.name + ".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0), 0o666)
+    try:
+        write_all(fd, data)
+    finally:
+        os.close(fd)
+    os.replace(tmp, dst)
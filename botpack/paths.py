@@ -1,9 +1,27 @@
 from __future__ import annotations
 
 import os
+import time
 from pathlib import Path
 
 
+# Files modified this recently are never trusted as unchanged by stat alone:
+# timestamp granularity could hide a same-size rewrite (the "racy git" problem).
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def is_racy(st: os.stat_result) -> bool:
+    """True if `st` changed too recently for its stat identity to be trusted."""
+
+    return time.time_ns() - max(st.st_mtime_ns, st.st_ctime_ns) < RACY_WINDOW_NS
+
+
+def stat_identity(st: os.stat_result) -> tuple[int, ...]:
+    """Key for caches of per-file derived data; changes whenever content may have."""
+
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+
+
 def repo_root() -> Path:
     return Path(__file__).resolve().parents[4]
 
@@ -47,7 +47,7 @@ def extract_pep723_script_toml(source: str) -> str | None:
     start_idx: int | None = None
 
     for i, line in enumerate(lines):
-        if line.lstrip().rstrip() == _START_MARKER:
+        if line.strip() == _START_MARKER:
             start_idx = i
             break
 
@@ -56,7 +56,7 @@ def extract_pep723_script_toml(source: str) -> str | None:
 
     payload_lines: list[str] = []
     for j in range(start_idx + 1, len(lines)):
-        marker = lines[j].lstrip().rstrip()
+        marker = lines[j].strip()
         if marker == _END_MARKER:
             return "\n".join(payload_lines)
 
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import functools
 import json
 import os
 import shutil
+import stat
 from dataclasses import dataclass
 from pathlib import Path
 
 from .lock import Lockfile
 from .paths import botyard_dir, pkgs_dir, store_dir
-from .store import StoredTree, store_materialize, tree_digest
+from .store import StoredTree, digest_algo, store_materialize, tree_digest
 
 
 @dataclass(frozen=True)
@@ -24,6 +26,7 @@ def _split_pkg_key(pkg_key: str) -> tuple[str, str]:
     return name, ver
 
 
+@functools.lru_cache(maxsize=2048)
 def _pkg_key_relpath(pkg_key: str) -> Path:
     """Human-readable package dir path.
 
@@ -34,8 +37,8 @@ def _pkg_key_relpath(pkg_key: str) -> Path:
     parts = [p for p in name.split("/") if p]
     if not parts:
         raise ValueError(f"invalid pkg key: {pkg_key!r}")
-    leaf = parts[-1] + "@" + ver
-    return Path(*parts[:-1], leaf)
+    parts[-1] += "@" + ver
+    return Path("/".join(parts))
 
 
 def _state_path() -> Path:
@@ -67,13 +70,24 @@ def _write_state(state: dict, *, dry_run: bool) -> None:
     tmp.replace(p)
 
 
-def _rm_any(path: Path) -> None:
-    if not path.exists() and not path.is_symlink():
-        return
-    if path.is_symlink() or path.is_file():
+def _classify(path: Path) -> tuple[bool, int]:
+    """Return (exists, st_mode) from a single lstat (symlinks are not followed)."""
+
+    try:
+        return True, os.lstat(path).st_mode
+    except FileNotFoundError:
+        return False, 0
+
+
+def _rm_any(path: Path, *, st_mode: int | None = None) -> None:
+    if st_mode is None:
+        exists, st_mode = _classify(path)
+        if not exists:
+            return
+    if stat.S_ISLNK(st_mode) or stat.S_ISREG(st_mode):
         path.unlink(missing_ok=True)
         return
-    if path.is_dir():
+    if stat.S_ISDIR(st_mode):
         shutil.rmtree(path)
 
 
@@ -90,18 +104,22 @@ def _prune_empty_parents(path: Path, *, stop: Path) -> None:
         cur = cur.parent
 
 
-def _is_correct(dest: Path, *, integrity: str, store_path: Path) -> bool:
-    if dest.is_symlink():
+def _is_correct(dest: Path, *, integrity: str, store_path: str, st_mode: int | None = None) -> bool:
+    if st_mode is None:
+        st_mode = _classify(dest)[1]
+    if stat.S_ISLNK(st_mode):
         try:
             target = os.readlink(dest)
         except OSError:
             return False
-        # Normalize relative targets.
-        resolved = (dest.parent / target).resolve() if not os.path.isabs(target) else Path(target).resolve()
-        return resolved == store_path.resolve()
-    if dest.is_dir():
+        # `store_dir()` is already resolved and we write absolute link targets, so a
+        # lexical comparison is enough (no realpath walk per package).
+        if not os.path.isabs(target):
+            target = os.path.normpath(os.path.join(os.fspath(dest.parent), target))
+        return target == store_path
+    if stat.S_ISDIR(st_mode):
         try:
-            return tree_digest(dest) == integrity
+            return tree_digest(dest, algo=digest_algo(integrity)) == integrity
         except Exception:
             return False
     return False
@@ -122,6 +140,8 @@ def materialize_pkgs(
     """
 
     root = pkgs_dir()
+    store_root = store_dir()
+    store_root_str = os.fspath(store_root)
 
     state = _load_state()
     prev_paths: dict[str, dict] = state.get("paths") if isinstance(state.get("paths"), dict) else {}
@@ -131,7 +151,7 @@ def materialize_pkgs(
     for pkg_key, pkg in lock.packages.items():
         if not pkg.integrity:
             continue
-        store_path = store_dir() / pkg.integrity
+        store_path = store_root / pkg.integrity
         if not store_path.exists():
             continue
         # IMPORTANT: do not resolve here; resolve() would collapse an existing symlink
@@ -151,12 +171,13 @@ def materialize_pkgs(
         spec = desired[dest_str]
         dest = Path(dest_str)
         integrity = spec["integrity"]
-        store_path = store_dir() / integrity
+        store_path_str = os.path.join(store_root_str, integrity)
+        store_path = Path(store_path_str)
 
         prev_entry = prev_paths.get(dest_str)
         owned = isinstance(prev_entry, dict)
 
-        pre_exists = dest.exists() or dest.is_symlink()
+        pre_exists, st_mode = _classify(dest)
 
         if pre_exists:
             if not owned and not force:
@@ -164,7 +185,7 @@ def materialize_pkgs(
                 if isinstance(prev_entry, dict):
                     next_paths[dest_str] = prev_entry
                 continue
-            if _is_correct(dest, integrity=integrity, store_path=store_path):
+            if _is_correct(dest, integrity=integrity, store_path=store_path_str, st_mode=st_mode):
                 next_paths[dest_str] = {"pkg_key": spec["pkg_key"], "integrity": integrity, "mode": prev_entry.get("mode") if isinstance(prev_entry, dict) else None}
                 continue
             # Owned but drifted/wrong: treat as tool-managed and repair.
@@ -188,18 +209,19 @@ def materialize_pkgs(
             dest = Path(dest_str)
             if not isinstance(prev_entry, dict):
                 continue
-            if not (dest.exists() or dest.is_symlink()):
+            exists, st_mode = _classify(dest)
+            if not exists:
                 continue
             integrity = prev_entry.get("integrity")
-            store_path = store_dir() / integrity if isinstance(integrity, str) else None
+            store_path = store_root / integrity if isinstance(integrity, str) else None
             if store_path is not None and store_path.exists() and not force:
                 # Refuse to delete if the directory was modified.
-                if not _is_correct(dest, integrity=str(integrity), store_path=store_path):
+                if not _is_correct(dest, integrity=str(integrity), store_path=os.fspath(store_path), st_mode=st_mode):
                     conflicts.append(dest_str)
                     next_paths[dest_str] = prev_entry
                     continue
             if not dry_run:
-                _rm_any(dest)
+                _rm_any(dest, st_mode=st_mode)
                 _prune_empty_parents(dest, stop=root)
             removed.append(dest_str)
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import json
 import os
 from dataclasses import dataclass
@@ -45,9 +46,18 @@ def _join_url(base: str, *parts: str) -> str:
     return b + "/" + "/".join(segs)
 
 
+@functools.lru_cache(maxsize=1024)
+def _versions_index_url(base: str, pkg_name: str) -> str:
+    segs = pkg_name.split("/")
+    if "" in segs or "." in segs:
+        return _join_url(base, pkg_name, "versions.json")
+    # Common case: one quote() over the whole name, "/" kept as the separator.
+    return f"{base}/{quote(pkg_name, safe='@-._~/')}/versions.json"
+
+
 def versions_index_url(pkg_name: str, *, base_url: str | None = None) -> str:
     base = (base_url or registry_base_url()).rstrip("/")
-    return _join_url(base, pkg_name, "versions.json")
+    return _versions_index_url(base, pkg_name)
 
 
 def _fetch_json(url: str, *, timeout_s: float = 10.0) -> Any:
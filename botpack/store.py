@@ -1,14 +1,69 @@
 from __future__ import annotations
 
 import hashlib
+import mmap
 import os
 import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator
 import errno
 
 from .paths import store_dir
 
+try:  # Optional: faster tree hashing when recorded integrities ask for it.
+    import blake3 as _blake3  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover (optional dependency)
+    _blake3 = None
+
+
+# Integrity prefix -> hash constructor. New store entries use `default_digest_algo()`
+# so lockfiles and trust pins stay reproducible across machines; other algorithms
+# are used to verify integrities that already name them.
+_DIGEST_ALGOS: dict[str, Callable[[], Any]] = {
+    "sha256": hashlib.sha256,
+    # Merkle framing: per-file sub-digests (hashed in parallel) folded in path order.
+    "sha256-v2": hashlib.sha256,
+}
+if _blake3 is not None:  # pragma: no cover (optional dependency)
+    _DIGEST_ALGOS["blake3"] = _blake3.blake3
+
+_MERKLE_ALGOS = {"sha256-v2"}
+
+DEFAULT_DIGEST_ALGO = "sha256"
+
+# Python 3.11+: runs the read/update loop in C and releases the GIL.
+_hashlib_file_digest = getattr(hashlib, "file_digest", None)
+
+
+def file_digest(f: BinaryIO, ctor: Callable[[], Any]) -> Any:
+    """Hash an open binary file with `ctor`; returns the hash object.
+
+    Uses `hashlib.file_digest` where available, else one contiguous update over
+    an mmap (no per-chunk Python frames; hashlib releases the GIL).
+    """
+
+    if _hashlib_file_digest is not None:
+        return _hashlib_file_digest(f, ctor)
+    h = ctor()
+    if os.fstat(f.fileno()).st_size:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            h.update(mm)
+    return h
+
+
+def sha256_is_accelerated() -> bool:
+    """True when `hashlib.sha256` is OpenSSL-backed (SHA-NI / ARMv8 SHA where the CPU has it).
+
+    Builds without `_hashlib` fall back to CPython's portable C implementation,
+    which is several times slower on large trees.
+    """
+
+    return type(hashlib.sha256()).__module__ == "_hashlib"
+
 
 @dataclass(frozen=True)
 class StoredTree:
@@ -16,36 +71,111 @@ class StoredTree:
     path: Path
 
 
-def tree_digest(root: Path) -> str:
+def _walk_sorted(root: Path) -> Iterator[tuple[bytes, os.DirEntry[str]]]:
+    """Yield (posix relpath bytes, entry) for every entry below `root`.
+
+    Entries come out in the same order as `sorted(root.rglob("*"))` (component-wise
+    by name), so digests stay stable. Symlinked directories are yielded but never
+    descended into.
+    """
+
+    stack: list[tuple[bytes, os.DirEntry[str]]] = []
+
+    def push(path: str, prefix: bytes) -> None:
+        with os.scandir(path) as it:
+            entries = [(prefix + e.name.encode("utf-8"), e) for e in it]
+        # Reverse order so popping from the stack visits names ascending.
+        entries.sort(key=itemgetter(0), reverse=True)
+        stack.extend(entries)
+
+    push(os.fspath(root), b"")
+    while stack:
+        rel, entry = stack.pop()
+        yield rel, entry
+        if entry.is_dir(follow_symlinks=False):
+            push(entry.path, rel + b"/")
+
+
+def digest_algo(integrity: str) -> str:
+    """Return the algorithm prefix of an integrity string (e.g. "sha256")."""
+
+    algo, sep, _ = integrity.partition(":")
+    if not sep or algo not in _DIGEST_ALGOS:
+        raise ValueError(f"unsupported integrity algorithm: {integrity!r}")
+    return algo
+
+
+def default_digest_algo() -> str:
+    """Algorithm for new store entries (override with BOTPACK_DIGEST_ALGO)."""
+
+    algo = os.environ.get("BOTPACK_DIGEST_ALGO") or DEFAULT_DIGEST_ALGO
+    if algo not in _DIGEST_ALGOS:
+        raise ValueError(f"unsupported digest algorithm: {algo}")
+    return algo
+
+
+def _file_sub_digest(path: str, ctor: Callable[[], Any]) -> bytes:
+    with open(path, "rb") as f:
+        return file_digest(f, ctor).digest()
+
+
+def _tree_digest_merkle(root: Path, *, algo: str) -> str:
+    ctor = _DIGEST_ALGOS[algo]
+
+    def frame(item: tuple[bytes, os.DirEntry[str]]) -> bytes:
+        rel, entry = item
+        if entry.is_dir():
+            return b""
+        if entry.is_symlink():
+            return b"L" + rel + b"\0" + os.readlink(entry.path).encode("utf-8") + b"\0"
+        if not entry.is_file():
+            return b""
+        return b"F" + rel + b"\0" + _file_sub_digest(entry.path, ctor) + b"\0"
+
+    entries = list(_walk_sorted(root))
+    h = ctor()
+    with ThreadPoolExecutor() as pool:
+        # map() yields in submission order, so the fold stays deterministic.
+        for fr in pool.map(frame, entries):
+            h.update(fr)
+    return algo + ":" + h.hexdigest()
+
+
+def tree_digest(root: Path, *, algo: str | None = None) -> str:
     """Compute a deterministic digest for a directory tree.
 
-    Digest is over (relative path, file bytes) for all regular files.
+    Digest is over (relative path, file bytes) for all regular files; Merkle
+    algorithms (e.g. "sha256-v2") hash per-file digests instead of raw bytes.
     """
 
+    if algo is None:
+        algo = default_digest_algo()
+    if algo not in _DIGEST_ALGOS:
+        raise ValueError(f"unsupported digest algorithm: {algo}")
     root = root.resolve()
-    h = hashlib.sha256()
-    for p in sorted(root.rglob("*")):
-        if p.is_dir():
+    if algo in _MERKLE_ALGOS:
+        return _tree_digest_merkle(root, algo=algo)
+    h = _DIGEST_ALGOS[algo]()
+    buf = bytearray(1024 * 1024)
+    view = memoryview(buf)
+    for rel, entry in _walk_sorted(root):
+        if entry.is_dir():
             continue
-        if p.is_symlink():
+        if entry.is_symlink():
             # Hash link target path string (do not follow).
-            rel = p.relative_to(root).as_posix().encode("utf-8")
-            h.update(b"L")
-            h.update(rel)
-            h.update(b"\0")
-            h.update(os.readlink(p).encode("utf-8"))
-            h.update(b"\0")
+            h.update(b"L" + rel + b"\0" + os.readlink(entry.path).encode("utf-8") + b"\0")
             continue
-        if not p.is_file():
+        if not entry.is_file():
             continue
 
-        rel = p.relative_to(root).as_posix().encode("utf-8")
-        h.update(b"F")
-        h.update(rel)
+        # One update per frame header; the byte stream is unchanged.
+        h.update(b"F" + rel + b"\0")
+        with open(entry.path, "rb") as f:
+            # Stream through one reused buffer: bounded memory, same digest.
+            while n := f.readinto(buf):
+                h.update(view[:n])
         h.update(b"\0")
-        h.update(p.read_bytes())
-        h.update(b"\0")
-    return "sha256:" + h.hexdigest()
+    return algo + ":" + h.hexdigest()
 
 
 def store_put_tree(src: Path) -> StoredTree:
@@ -59,11 +189,18 @@ def store_put_tree(src: Path) -> StoredTree:
         return StoredTree(digest=digest, path=dst)
 
     dst.parent.mkdir(parents=True, exist_ok=True)
-    tmp = dst.with_name(dst.name + ".tmp")
-    if tmp.exists():
-        shutil.rmtree(tmp)
-    shutil.copytree(src, tmp, symlinks=True)
-    tmp.replace(dst)
+    # Unique per call so concurrent installs never clobber each other's staging dir.
+    tmp = Path(tempfile.mkdtemp(dir=dst.parent, prefix=dst.name + ".tmp."))
+    try:
+        # Never hardlink into the store: `src` may be a mutable working tree, and a
+        # later in-place edit would silently change content under this digest.
+        _clone_tree(src, tmp, prefer=("reflink", "copy"))
+        os.replace(tmp, dst)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        # Another writer published the same digest first; content is identical.
+        if not dst.is_dir():
+            raise
     return StoredTree(digest=digest, path=dst)
 
 
@@ -105,22 +242,95 @@ def _rm_any(path: Path) -> None:
         shutil.rmtree(path)
 
 
-def _hardlink_tree(src: Path, dst: Path) -> None:
+def copy_range_fd(fin: int, fout: int) -> bool:
+    """Copy all of `fin` into `fout` via `os.copy_file_range` (in-kernel; a CoW clone on btrfs/XFS).
+
+    Returns False when the platform/filesystem can't do it, so callers fall back.
+    """
+
+    copy_range = getattr(os, "copy_file_range", None)
+    if copy_range is None:
+        return False
+    try:
+        remaining = os.fstat(fin).st_size
+        while remaining > 0:
+            n = copy_range(fin, fout, remaining)
+            if n == 0:
+                break
+            remaining -= n
+        return remaining == 0
+    except OSError:
+        return False
+
+
+def _copy_range(src: str, dst: str) -> bool:
+    try:
+        with open(src, "rb") as fin, open(dst, "wb") as fout:
+            return copy_range_fd(fin.fileno(), fout.fileno())
+    except OSError:
+        return False
+
+
+def clone_file(src: Path | str, dst: Path | str) -> None:
+    """Copy file bytes without routing them through Python objects.
+
+    Prefers `copy_file_range`, then `shutil.copyfile` (sendfile on Linux).
+    Metadata is not copied.
+    """
+
+    if not _copy_range(os.fspath(src), os.fspath(dst)):
+        shutil.copyfile(src, dst)
+
+
+def _clone_tree(src: Path, dst: Path, *, prefer: tuple[str, ...] = ("reflink", "copy")) -> None:
+    """Recreate `src` at `dst`, trying each strategy in `prefer` per file.
+
+    Strategies: "hardlink" (share inodes), "reflink" (`copy_file_range`), "copy".
+    Symlinks are recreated, never followed. Copied files and directories keep
+    their mode/times like `shutil.copytree`.
+    """
+
     dst.mkdir(parents=True, exist_ok=True)
-    for p in sorted(src.rglob("*")):
-        rel = p.relative_to(src)
-        out = dst / rel
-        if p.is_dir():
-            out.mkdir(parents=True, exist_ok=True)
+    dirs: list[tuple[str, Path]] = [(os.fspath(src), dst)]
+    # Pre-order walk: parents are always created before their children.
+    for rel, entry in _walk_sorted(src):
+        out = dst / rel.decode("utf-8")
+        if entry.is_symlink():
+            os.symlink(os.readlink(entry.path), out)
             continue
-        if p.is_symlink():
-            out.parent.mkdir(parents=True, exist_ok=True)
-            os.symlink(os.readlink(p), out)
+        if entry.is_dir():
+            out.mkdir(exist_ok=True)
+            dirs.append((entry.path, out))
             continue
-        if p.is_file():
-            out.parent.mkdir(parents=True, exist_ok=True)
-            os.link(p, out)
+        if entry.is_file():
+            _clone_one(entry.path, out, prefer)
             continue
+    if prefer != ("hardlink",):
+        for s, d in reversed(dirs):
+            shutil.copystat(s, d)
+
+
+def _clone_one(src: str, out: Path, prefer: tuple[str, ...]) -> None:
+    last: OSError | None = None
+    for strategy in prefer:
+        try:
+            if strategy == "hardlink":
+                os.link(src, out)
+                return
+            if strategy == "reflink":
+                if not _copy_range(src, os.fspath(out)):
+                    continue
+            elif strategy == "copy":
+                shutil.copyfile(src, out)
+            else:
+                raise ValueError(f"unsupported clone strategy: {strategy}")
+            shutil.copystat(src, out)
+            return
+        except OSError as e:
+            last = e
+    if last is not None:
+        raise last
+    raise OSError(f"could not clone {src} -> {out} (tried {', '.join(prefer)})")
 
 
 def _materialize_tree(*, src: Path, dest: Path, mode: str) -> None:
@@ -139,14 +349,14 @@ def _materialize_tree(*, src: Path, dest: Path, mode: str) -> None:
         return
 
     if mode == "copy":
-        shutil.copytree(src, tmp, symlinks=True)
+        _clone_tree(src, tmp, prefer=("reflink", "copy"))
         _rm_any(dest)
         tmp.replace(dest)
         return
 
     # hardlink
     try:
-        _hardlink_tree(src, tmp)
+        _clone_tree(src, tmp, prefer=("hardlink",))
     except OSError as e:
         # Surface the failure to allow auto fallback.
         if getattr(e, "errno", None) in {errno.EXDEV, errno.EPERM, errno.EACCES}:
@@ -12,19 +12,36 @@ Constraints:
 - stdlib-only formatting (parsing lives elsewhere)
 """
 
-import json
-from typing import Any, Mapping
+import re
+from typing import Any, Callable, Mapping
+
+# Same escaping as `json.dumps(s, ensure_ascii=False)`, which is also valid TOML.
+_BASIC_ESCAPES = {i: f"\\u{i:04x}" for i in range(0x20)}
+_BASIC_ESCAPES.update(
+    {
+        ord('"'): '\\"',
+        ord("\\"): "\\\\",
+        0x08: "\\b",
+        0x09: "\\t",
+        0x0A: "\\n",
+        0x0C: "\\f",
+        0x0D: "\\r",
+    }
+)
+_NEEDS_ESCAPE = re.compile(r'["\\\x00-\x1f]')
 
 
 def toml_basic_string(s: str) -> str:
     """Quote a string as a TOML basic string.
 
-    We use JSON encoding for predictable escaping + double quotes.
+    Escaping matches JSON encoding (predictable escapes + double quotes).
     """
 
     if not isinstance(s, str):
         raise TypeError("toml_basic_string: expected str")
-    return json.dumps(s, ensure_ascii=False)
+    if _NEEDS_ESCAPE.search(s) is None:
+        return '"' + s + '"'
+    return '"' + s.translate(_BASIC_ESCAPES) + '"'
 
 
 def toml_bool(v: bool) -> str:
@@ -39,7 +56,18 @@ def toml_int(v: int) -> str:
     return str(v)
 
 
+_VALUE_DISPATCH: dict[type, Callable[[Any], str]] = {
+    bool: lambda v: "true" if v else "false",
+    int: str,
+    str: lambda v: toml_basic_string(v),
+}
+
+
 def toml_value(v: Any) -> str:
+    # Exact-type fast path; subclasses (e.g. enums) take the isinstance chain below.
+    fn = _VALUE_DISPATCH.get(type(v))
+    if fn is not None:
+        return fn(v)
     if isinstance(v, bool):
         return toml_bool(v)
     if isinstance(v, int) and not isinstance(v, bool):
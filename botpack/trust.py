@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
 
-from .config import parse_trust_toml_file
+from .config import parse_trust_toml_file, trust_path
+from .models import TrustConfig, TrustEntry
+from .paths import is_racy, stat_identity
 
 
 @dataclass(frozen=True)
@@ -19,70 +24,124 @@ class TrustDecision:
 WORKSPACE_TRUST_KEY = "__workspace__"
 
 
-def check_mcp_server_trust(
+# trust.toml path -> (stat_identity, parsed config). Keyed by stat so edits from
+# other processes are picked up; racy files are never cached, and
+# trust_edit.save_trust also invalidates.
+_trust_cache: dict[Path, tuple[tuple[int, ...], TrustConfig]] = {}
+
+
+def _get_trust_cfg() -> TrustConfig:
+    path = trust_path()
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return parse_trust_toml_file(path)
+    if is_racy(st):
+        _trust_cache.pop(path, None)
+        return parse_trust_toml_file(path)
+    key = stat_identity(st)
+    hit = _trust_cache.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    cfg = parse_trust_toml_file(path)
+    _trust_cache[path] = (key, cfg)
+    return cfg
+
+
+def _invalidate_trust_cache() -> None:
+    _trust_cache.clear()
+
+
+@dataclass(frozen=True)
+class TrustRequest:
+    pkg_key: str
+    integrity: str | None
+    needs_exec: bool
+    needs_mcp: bool
+    fqid: str | None = None  # MCP server id; None for a package-level check
+
+
+def check_trust_batch(
+    requests: Sequence[TrustRequest],
     *,
-    pkg_key: str,
-    integrity: str | None,
-    fqid: str,
-    needs_exec: bool,
-    needs_mcp: bool,
-) -> TrustDecision:
-    """Evaluate trust for a single MCP server coming from a package.
+    trust: TrustConfig | None = None,
+) -> list[TrustDecision]:
+    """Evaluate many trust requests against one trust.toml load.
 
-    Trust is keyed by package (e.g. "@acme/mcp-pack@0.3.0") and may include
-    optional per-server overrides under entry.mcp[<fqid>].
+    Entry lookup and the digest comparison happen once per package; decisions
+    come back in request order.
     """
 
-    cfg = parse_trust_toml_file()
-    entry = cfg.packages.get(pkg_key)
-
+    cfg = trust if trust is not None else _get_trust_cfg()
+    # (pkg_key, integrity) -> (entry, digest-mismatch reason shared by its requests)
+    by_pkg: dict[tuple[str, str | None], tuple[TrustEntry | None, str | None]] = {}
+    out: list[TrustDecision] = []
+    for req in requests:
+        key = (req.pkg_key, req.integrity)
+        resolved = by_pkg.get(key)
+        if resolved is None:
+            entry = cfg.packages.get(req.pkg_key)
+            bad = None
+            if entry is not None and req.integrity and entry.digest and entry.digest.integrity != req.integrity:
+                bad = f"{req.pkg_key}: trust.digest mismatch (trust={entry.digest.integrity}, got={req.integrity})"
+            resolved = by_pkg[key] = (entry, bad)
+        out.append(_decide(req, *resolved))
+    return out
+
+
+def _decide(req: TrustRequest, entry: TrustEntry | None, bad_digest: str | None) -> TrustDecision:
+    pkg_key = req.pkg_key
     if entry is None:
-        if needs_exec or needs_mcp:
+        if req.needs_exec or req.needs_mcp:
             return TrustDecision(ok=False, reason=f"{pkg_key}: requires trust for exec/mcp")
         return TrustDecision(ok=True)
 
-    if integrity and entry.digest and entry.digest.integrity != integrity:
-        return TrustDecision(
-            ok=False,
-            reason=f"{pkg_key}: trust.digest mismatch (trust={entry.digest.integrity}, got={integrity})",
-        )
+    if bad_digest is not None:
+        return TrustDecision(ok=False, reason=bad_digest)
 
-    override = entry.mcp.get(fqid)
-    allow_exec = override.allow_exec if override is not None else entry.allow_exec
-    allow_mcp = override.allow_mcp if override is not None else entry.allow_mcp
+    allow_exec, allow_mcp = entry.allow_exec, entry.allow_mcp
+    suffix = ""
+    if req.fqid is not None:
+        override = entry.mcp.get(req.fqid)
+        if override is not None:
+            allow_exec, allow_mcp = override.allow_exec, override.allow_mcp
+        suffix = f" for {req.fqid}"
 
-    if needs_exec and not allow_exec:
-        return TrustDecision(ok=False, reason=f"{pkg_key}: exec not trusted for {fqid}")
-    if needs_mcp and not allow_mcp:
-        return TrustDecision(ok=False, reason=f"{pkg_key}: mcp not trusted for {fqid}")
+    if req.needs_exec and not allow_exec:
+        return TrustDecision(ok=False, reason=f"{pkg_key}: exec not trusted{suffix}")
+    if req.needs_mcp and not allow_mcp:
+        return TrustDecision(ok=False, reason=f"{pkg_key}: mcp not trusted{suffix}")
 
     return TrustDecision(ok=True)
 
 
-def check_package_trust(
+def check_mcp_server_trust(
     *,
     pkg_key: str,
     integrity: str | None,
+    fqid: str,
     needs_exec: bool,
     needs_mcp: bool,
+    trust: TrustConfig | None = None,
 ) -> TrustDecision:
-    cfg = parse_trust_toml_file()
-    entry = cfg.packages.get(pkg_key)
+    """Evaluate trust for a single MCP server coming from a package.
 
-    if entry is None:
-        if needs_exec or needs_mcp:
-            return TrustDecision(ok=False, reason=f"{pkg_key}: requires trust for exec/mcp")
-        return TrustDecision(ok=True)
+    Trust is keyed by package (e.g. "@acme/mcp-pack@0.3.0") and may include
+    optional per-server overrides under entry.mcp[<fqid>]. Pass `trust` to reuse
+    an already-parsed trust.toml across many checks.
+    """
 
-    if integrity and entry.digest and entry.digest.integrity != integrity:
-        return TrustDecision(
-            ok=False,
-            reason=f"{pkg_key}: trust.digest mismatch (trust={entry.digest.integrity}, got={integrity})",
-        )
+    req = TrustRequest(pkg_key=pkg_key, integrity=integrity, needs_exec=needs_exec, needs_mcp=needs_mcp, fqid=fqid)
+    return check_trust_batch([req], trust=trust)[0]
 
-    if needs_exec and not entry.allow_exec:
-        return TrustDecision(ok=False, reason=f"{pkg_key}: exec not trusted")
-    if needs_mcp and not entry.allow_mcp:
-        return TrustDecision(ok=False, reason=f"{pkg_key}: mcp not trusted")
 
-    return TrustDecision(ok=True)
+def check_package_trust(
+    *,
+    pkg_key: str,
+    integrity: str | None,
+    needs_exec: bool,
+    needs_mcp: bool,
+    trust: TrustConfig | None = None,
+) -> TrustDecision:
+    req = TrustRequest(pkg_key=pkg_key, integrity=integrity, needs_exec=needs_exec, needs_mcp=needs_mcp)
+    return check_trust_batch([req], trust=trust)[0]
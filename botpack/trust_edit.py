@@ -2,11 +2,14 @@ from __future__ import annotations
 
 """Deterministic editing + rewriting of .botpack/trust.toml."""
 
+from contextlib import contextmanager
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from .errors import ConfigParseError, ConfigValidationError
 from .toml_write import toml_basic_string, toml_value
+from .trust import _invalidate_trust_cache
 
 
 try:  # Python 3.11+
@@ -36,6 +39,58 @@ def load_trust_raw(path: Path) -> dict[str, Any]:
     return dict(data)
 
 
+class TrustEditor:
+    """In-memory trust.toml edits; see `trust_session`."""
+
+    def __init__(self, path: Path, data: dict[str, Any]) -> None:
+        self.path = path
+        self.data = data
+
+    def allow(
+        self,
+        *,
+        pkg_key: str,
+        allow_exec: bool | None = None,
+        allow_mcp: bool | None = None,
+        integrity: str | None = None,
+    ) -> None:
+        # `data` is a freshly parsed table owned by this editor, so nested tables
+        # are mutated in place rather than copied.
+        entry = self.data.get(pkg_key)
+        if entry is None:
+            entry = self.data[pkg_key] = {}
+        elif not isinstance(entry, dict):
+            raise ConfigValidationError(path=self.path, message=f"{pkg_key}: expected table")
+
+        if allow_exec is not None:
+            entry["allowExec"] = bool(allow_exec)
+        if allow_mcp is not None:
+            entry["allowMcp"] = bool(allow_mcp)
+
+        if integrity is not None:
+            digest = entry.get("digest")
+            if digest is None:
+                digest = entry["digest"] = {}
+            elif not isinstance(digest, dict):
+                raise ConfigValidationError(path=self.path, message=f"{pkg_key}.digest: expected table")
+            digest["integrity"] = integrity
+
+    def revoke(self, *, pkg_key: str) -> bool:
+        existed = pkg_key in self.data
+        self.data.pop(pkg_key, None)
+        return existed
+
+
+@contextmanager
+def trust_session(path: Path, *, dry_run: bool = False) -> Iterator[TrustEditor]:
+    """Load trust.toml once, apply any number of edits, and write it once on success."""
+
+    editor = TrustEditor(path, load_trust_raw(path))
+    yield editor
+    editor.data.setdefault("version", 1)
+    save_trust(path, editor.data, dry_run=dry_run)
+
+
 def trust_allow(
     path: Path,
     *,
@@ -43,58 +98,41 @@ def trust_allow(
     allow_exec: bool | None = None,
     allow_mcp: bool | None = None,
     integrity: str | None = None,
+    dry_run: bool = False,
 ) -> None:
-    data = load_trust_raw(path)
-    if "version" not in data:
-        data["version"] = 1
-
-    entry_raw = data.get(pkg_key)
-    if entry_raw is None:
-        entry: dict[str, Any] = {}
-    elif isinstance(entry_raw, dict):
-        entry = dict(entry_raw)
-    else:
-        raise ConfigValidationError(path=path, message=f"{pkg_key}: expected table")
-
-    if allow_exec is not None:
-        entry["allowExec"] = bool(allow_exec)
-    if allow_mcp is not None:
-        entry["allowMcp"] = bool(allow_mcp)
-
-    if integrity is not None:
-        digest_raw = entry.get("digest")
-        digest: dict[str, Any]
-        if digest_raw is None:
-            digest = {}
-        elif isinstance(digest_raw, dict):
-            digest = dict(digest_raw)
-        else:
-            raise ConfigValidationError(path=path, message=f"{pkg_key}.digest: expected table")
-        digest["integrity"] = integrity
-        entry["digest"] = digest
-
-    data[pkg_key] = entry
-    save_trust(path, data)
-
-
-def trust_revoke(path: Path, *, pkg_key: str) -> bool:
-    data = load_trust_raw(path)
-    existed = pkg_key in data
-    data.pop(pkg_key, None)
-    if "version" not in data:
-        data["version"] = 1
-    save_trust(path, data)
-    return existed
+    with trust_session(path, dry_run=dry_run) as t:
+        t.allow(pkg_key=pkg_key, allow_exec=allow_exec, allow_mcp=allow_mcp, integrity=integrity)
+
+
+def trust_revoke(path: Path, *, pkg_key: str, dry_run: bool = False) -> bool:
+    with trust_session(path, dry_run=dry_run) as t:
+        return t.revoke(pkg_key=pkg_key)
+
 
+def save_trust(path: Path, data: dict[str, Any], *, dry_run: bool = False) -> str:
+    """Validate + render `data` as trust.toml and write it atomically.
+
+    Returns the rendered text; with `dry_run` nothing is written. Nothing on disk
+    is touched unless rendering succeeds.
+    """
+
+    text = render_trust(data, path=path)
+    if not dry_run:
+        _atomic_write_text(path, text)
+    return text
+
+
+def render_trust(data: dict[str, Any], *, path: Path) -> str:
+    """Validate `data` and render it as trust.toml text (`path` is for error messages)."""
 
-def save_trust(path: Path, data: dict[str, Any]) -> None:
     if "version" not in data:
         raise ConfigValidationError(path=path, message="version: required")
-    if not isinstance(data.get("version"), int) or isinstance(data.get("version"), bool):
+    version = data["version"]
+    if not isinstance(version, int) or isinstance(version, bool):
         raise ConfigValidationError(path=path, message="version: expected integer")
 
     lines: list[str] = []
-    lines.append(f"version = {toml_value(int(data['version']))}")
+    lines.append(f"version = {toml_value(int(version))}")
 
     # Collect package entries, ignore non-string keys (invalid).
     pkg_keys = [k for k in data.keys() if k != "version"]
@@ -102,20 +140,21 @@ def save_trust(path: Path, data: dict[str, Any]) -> None:
         if not isinstance(k, str):
             raise ConfigValidationError(path=path, message="trust entries: keys must be strings")
 
+    append = lines.append
     for pkg_key in sorted(pkg_keys):
-        raw = data.get(pkg_key)
-        if not isinstance(raw, dict):
+        entry = data.get(pkg_key)
+        if not isinstance(entry, dict):
             raise ConfigValidationError(path=path, message=f"{pkg_key}: expected table")
-        entry = dict(raw)
+        qpk = toml_basic_string(pkg_key)
 
         # Top-level entry table.
-        lines.append("")
-        lines.append(f"[{toml_basic_string(pkg_key)}]")
+        append("")
+        append(f"[{qpk}]")
         # Keep stable key order; omit absent.
         if "allowExec" in entry:
-            lines.append(f"allowExec = {toml_value(bool(entry['allowExec']))}")
+            append(f"allowExec = {toml_value(bool(entry['allowExec']))}")
         if "allowMcp" in entry:
-            lines.append(f"allowMcp = {toml_value(bool(entry['allowMcp']))}")
+            append(f"allowMcp = {toml_value(bool(entry['allowMcp']))}")
 
         # Digest subtable (if present).
         digest = entry.get("digest")
@@ -124,30 +163,33 @@ def save_trust(path: Path, data: dict[str, Any]) -> None:
                 raise ConfigValidationError(path=path, message=f"{pkg_key}.digest: expected table")
             if "integrity" not in digest:
                 raise ConfigValidationError(path=path, message=f"{pkg_key}.digest.integrity: required")
-            lines.append("")
-            lines.append(f"[{toml_basic_string(pkg_key)}.digest]")
-            lines.append(f"integrity = {toml_value(digest['integrity'])}")
+            append("")
+            append(f"[{qpk}.digest]")
+            append(f"integrity = {toml_value(digest['integrity'])}")
 
         # MCP per-server overrides (if present).
         mcp = entry.get("mcp")
         if mcp is not None:
             if not isinstance(mcp, dict):
                 raise ConfigValidationError(path=path, message=f"{pkg_key}.mcp: expected table")
-            for server_id in sorted(mcp.keys()):
+            for server_id, srv in sorted(mcp.items(), key=itemgetter(0)):
                 if not isinstance(server_id, str):
                     raise ConfigValidationError(path=path, message=f"{pkg_key}.mcp: server id keys must be strings")
-                srv = mcp.get(server_id)
                 if not isinstance(srv, dict):
                     raise ConfigValidationError(path=path, message=f"{pkg_key}.mcp.{server_id}: expected table")
-                lines.append("")
-                lines.append(f"[{toml_basic_string(pkg_key)}.mcp.{toml_basic_string(server_id)}]")
+                append("")
+                append(f"[{qpk}.mcp.{toml_basic_string(server_id)}]")
                 if "allowExec" in srv:
-                    lines.append(f"allowExec = {toml_value(bool(srv['allowExec']))}")
+                    append(f"allowExec = {toml_value(bool(srv['allowExec']))}")
                 if "allowMcp" in srv:
-                    lines.append(f"allowMcp = {toml_value(bool(srv['allowMcp']))}")
+                    append(f"allowMcp = {toml_value(bool(srv['allowMcp']))}")
+
+    return "\n".join(lines) + "\n"
+
 
-    text = "\n".join(lines) + "\n"
+def _atomic_write_text(path: Path, text: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_name(path.name + ".tmp")
     tmp.write_text(text, encoding="utf-8")
     tmp.replace(path)
+    _invalidate_trust_cache()
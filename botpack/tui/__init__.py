@@ -3,7 +3,30 @@
 This package intentionally keeps its surface small and dependency-free:
 - tmux wrapper for launching TUIs with transcript capture
 - matrix artifact helpers for recording results
+
+Exports are resolved lazily so importing a sibling module (e.g. config_snippets)
+does not pull in the tmux/matrix helpers.
 """
 
-from .matrix import MatrixRun, MatrixStatus  # noqa: F401
-from .tmux import TmuxSession  # noqa: F401
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .matrix import MatrixRun, MatrixStatus
+    from .tmux import TmuxSession
+
+__all__ = ["MatrixRun", "MatrixStatus", "TmuxSession"]
+
+_LAZY = {"MatrixRun": ".matrix", "MatrixStatus": ".matrix", "TmuxSession": ".tmux"}
+
+
+def __getattr__(name: str) -> Any:
+    mod = _LAZY.get(name)
+    if mod is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(mod, __name__), name)
+    globals()[name] = value
+    return value
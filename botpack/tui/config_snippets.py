@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import json
 import sys
-from typing import Literal
+from types import MappingProxyType
+from typing import Literal, Mapping
 
 
 TuiConfigName = Literal["codex", "coder", "amp"]
@@ -12,43 +13,61 @@ def _toml_array_str(xs: list[str]) -> str:
     return "[" + ", ".join(json.dumps(x, ensure_ascii=False) for x in xs) + "]"
 
 
-def codex_mcp_magic_number_snippet() -> str:
-    py = sys.executable
-    return (
-        "[mcp_servers.mcp-magic-number]\n"
-        f"command = {json.dumps(py, ensure_ascii=False)}\n"
-        f"args = {_toml_array_str(['-m', 'botpack.mcp_magic_number_server'])}\n"
+# The snippets only depend on the running interpreter, so build them once.
+_MAGIC_NUMBER_ARGS = ["-m", "botpack.mcp_magic_number_server"]
+
+_CODEX_SNIPPET = (
+    "[mcp_servers.mcp-magic-number]\n"
+    f"command = {json.dumps(sys.executable, ensure_ascii=False)}\n"
+    f"args = {_toml_array_str(_MAGIC_NUMBER_ARGS)}\n"
+)
+
+_AMP_SNIPPET = (
+    json.dumps(
+        {
+            "amp": {
+                "mcpServers": {
+                    "mcp-magic-number": {
+                        "transport": "stdio",
+                        "command": sys.executable,
+                        "args": _MAGIC_NUMBER_ARGS,
+                    }
+                }
+            }
+        },
+        sort_keys=True,
+        indent=2,
     )
+    + "\n"
+)
+
+
+def codex_mcp_magic_number_snippet() -> str:
+    return _CODEX_SNIPPET
 
 
 def coder_mcp_magic_number_snippet() -> str:
     # just-every/code uses the same TOML shape as Codex.
-    return codex_mcp_magic_number_snippet()
+    return _CODEX_SNIPPET
 
 
 def amp_mcp_magic_number_snippet() -> str:
-    py = sys.executable
-    payload = {
-        "amp": {
-            "mcpServers": {
-                "mcp-magic-number": {
-                    "transport": "stdio",
-                    "command": py,
-                    "args": ["-m", "botpack.mcp_magic_number_server"],
-                }
-            }
-        }
+    return _AMP_SNIPPET
+
+
+_SNIPPETS: Mapping[str, tuple[str, str]] = MappingProxyType(
+    {
+        "codex": ("toml", _CODEX_SNIPPET),
+        "coder": ("toml", _CODEX_SNIPPET),
+        "amp": ("json", _AMP_SNIPPET),
     }
-    return json.dumps(payload, sort_keys=True, indent=2) + "\n"
+)
 
 
 def snippet_for(tui: TuiConfigName) -> tuple[str, str]:
     """Return (format, snippet) for the given TUI."""
 
-    if tui == "codex":
-        return ("toml", codex_mcp_magic_number_snippet())
-    if tui == "coder":
-        return ("toml", coder_mcp_magic_number_snippet())
-    if tui == "amp":
-        return ("json", amp_mcp_magic_number_snippet())
-    raise ValueError(f"unsupported tui: {tui}")
+    try:
+        return _SNIPPETS[tui]
+    except KeyError:
+        raise ValueError(f"unsupported tui: {tui}") from None
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
 import os
@@ -10,25 +11,36 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Literal
 
+from ..fileio import atomic_write_bytes, dump_json_bytes, loads_json
+from ..paths import is_racy, stat_identity
 from .config_snippets import snippet_for
 
-
-_ID_SAFE_RE = re.compile(r"[^A-Za-z0-9_-]+")
+_ID_SAFE_RE = re.compile(r"[^A-Za-z0-9_-]+", re.ASCII)
 
 
+# Ids are pure functions of the fqid and recur on every apply (codex, coder, amp).
+@functools.lru_cache(maxsize=1024)
 def _safe_id(s: str) -> str:
     s2 = _ID_SAFE_RE.sub("-", s.strip())
     s2 = s2.strip("-")
     return s2 or "server"
 
 
+@functools.lru_cache(maxsize=1024)
 def _home_id_for_fqid(fqid: str) -> str:
     # Prefer a stable, human-readable id. TOML bare keys allow letters, digits, underscores, and dashes.
     return _safe_id(fqid.replace("/", "-"))
 
 
+# Reused encoders: json.dumps() with non-default options builds a new JSONEncoder
+# per call. Separators are left at their defaults so output is unchanged.
+_QUOTE_ENCODER = json.JSONEncoder(ensure_ascii=False)
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, ensure_ascii=False)
+_SETTINGS_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+
 def _toml_quote(s: str) -> str:
-    return json.dumps(s, ensure_ascii=False)
+    return _QUOTE_ENCODER.encode(s)
 
 
 def _toml_array(xs: list[str]) -> str:
@@ -36,39 +48,39 @@ def _toml_array(xs: list[str]) -> str:
 
 
 def _toml_inline_env(env: dict[str, str]) -> str:
-    parts: list[str] = []
-    for k in sorted(env.keys()):
-        parts.append(f"{_toml_quote(k)} = {_toml_quote(env[k])}")
-    return "{ " + ", ".join(parts) + " }"
+    q = _toml_quote
+    return "{ " + ", ".join(f"{q(k)} = {q(env[k])}" for k in sorted(env)) + " }"
 
 
 def _render_toml_mcp_servers(servers: list[dict[str, object]]) -> str:
-    lines: list[str] = []
+    # One string per [mcp_servers.<id>] table; tables are separated by a blank line.
+    q = _toml_quote
+    blocks: list[str] = []
     for s in servers:
-        sid = str(s["id"])
-        transport = str(s["transport"])
-        lines.append(f"[mcp_servers.{sid}]")
-        if transport == "stdio":
-            lines.append(f"command = {_toml_quote(str(s['command']))}")
-            lines.append(f"args = {_toml_array(list(s.get('args') or []))}")
+        if s["transport"] == "stdio":
+            body = f"command = {q(str(s['command']))}\nargs = {_toml_array(list(s.get('args') or []))}"
         else:
-            lines.append(f"url = {_toml_quote(str(s['url']))}")
+            body = f"url = {q(str(s['url']))}"
         env = s.get("env")
         if isinstance(env, dict) and env:
-            lines.append(f"env = {_toml_inline_env({str(k): str(v) for k, v in env.items()})}")
-        lines.append("")
-    return "\n".join(lines).rstrip() + "\n" if lines else ""
+            body += f"\nenv = {_toml_inline_env({str(k): str(v) for k, v in env.items()})}"
+        blocks.append(f"[mcp_servers.{s['id']}]\n{body}\n")
+    return "\n".join(blocks)
 
 
 def _canonical_json(obj: object) -> str:
-    return json.dumps(obj, sort_keys=True, ensure_ascii=False)
+    # Stays on the stdlib encoder: its separators define the drift hashes already
+    # recorded in home-config state.
+    return _CANONICAL_ENCODER.encode(obj)
 
 
 def _sha256_json(obj: object) -> str:
     return hashlib.sha256(_canonical_json(obj).encode("utf-8")).hexdigest()
 
 
+@functools.lru_cache(maxsize=1)
 def _builtin_magic_server() -> dict[str, object]:
+    # Constant for the process (only sys.executable varies); shared, so never mutate it.
     import sys
 
     return {
@@ -79,61 +91,96 @@ def _builtin_magic_server() -> dict[str, object]:
     }
 
 
+_MISSING_IDENT: tuple[int, ...] = ()
+
+# (roots, manifest/lock/trust paths) -> (their identities, workspace servers.toml, its identity, servers, blocked).
+# One entry per project: a changed input replaces the entry instead of adding one.
+_project_servers_cache: dict[
+    tuple[Path, Path, tuple[Path, ...]],
+    tuple[tuple, Path | None, tuple[int, ...], list[dict[str, object]], list[str]],
+] = {}
+
+
+def _cache_ident(path: Path) -> tuple[int, ...] | None:
+    """`stat_identity` of `path`; `_MISSING_IDENT` if absent; None if too fresh to trust."""
+
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return _MISSING_IDENT
+    except OSError:
+        return None
+    return None if is_racy(st) else stat_identity(st)
+
+
 def _try_collect_project_servers() -> tuple[list[dict[str, object]], list[str]]:
     """Best-effort collect project-derived servers (workspace + packages).
 
     Returns (servers, blocked_reasons). If no botpack project is present, returns empty.
+    Results are reused across applies (codex, coder, amp in turn) while the
+    manifest, lockfile, trust.toml and workspace servers.toml are unchanged;
+    package servers.toml files live under content-addressed store paths.
     """
 
+    from ..config import botyard_manifest_path, trust_path
+    from ..install import default_lock_path
+    from ..paths import store_dir, work_root
+
+    files = (botyard_manifest_path(), default_lock_path(), trust_path())
+    idents = tuple(_cache_ident(f) for f in files)
+    cacheable = None not in idents
+    key = (work_root(), store_dir(), files)
+
+    hit = _project_servers_cache.get(key) if cacheable else None
+    if hit is not None:
+        hit_idents, ws_toml, ws_ident, servers, blocked = hit
+        if hit_idents == idents and (ws_toml is None or _cache_ident(ws_toml) == ws_ident):
+            return ([dict(s) for s in servers], list(blocked))
+
+    servers, blocked, ws_toml = _collect_project_servers()
+    ws_ident = _cache_ident(ws_toml) if ws_toml is not None else _MISSING_IDENT
+    if cacheable and ws_ident is not None:
+        _project_servers_cache[key] = (idents, ws_toml, ws_ident, [dict(s) for s in servers], list(blocked))
+    else:
+        _project_servers_cache.pop(key, None)
+    return (servers, blocked)
+
+
+def _collect_project_servers() -> tuple[list[dict[str, object]], list[str], Path | None]:
+    """Uncached body of `_try_collect_project_servers`; also returns the workspace servers.toml path."""
+
     from ..config import botyard_manifest_path, parse_botyard_toml_file
     from ..install import default_lock_path
-    from ..mcp import build_mcp_servers
+    from ..mcp import McpServer, build_mcp_servers
     from ..paths import store_dir, work_root
-    from ..trust import WORKSPACE_TRUST_KEY, check_mcp_server_trust
+    from ..trust import WORKSPACE_TRUST_KEY, TrustRequest, check_trust_batch
     from ..lock import load_lock
 
     manifest = botyard_manifest_path()
     if not manifest.exists():
-        return ([], [])
+        return ([], [], None)
 
     try:
         cfg = parse_botyard_toml_file(manifest)
     except Exception:
-        return ([], [])
+        return ([], [], None)
 
     root = work_root()
     ws = Path(cfg.workspace.dir)
     if not ws.is_absolute():
         ws = (root / ws).resolve()
 
-    servers: list[dict[str, object]] = []
     blocked: list[str] = []
+    # (trust key, integrity, server) for every workspace/package server; trust is
+    # evaluated for all of them in one batch below.
+    candidates: list[tuple[str, str | None, McpServer]] = []
 
     ws_prefix = cfg.workspace.name.replace("/", "-").replace("@", "") if cfg.workspace.name else "workspace"
 
     ws_servers_toml = ws / "mcp" / "servers.toml"
     if ws_servers_toml.exists():
         for s in build_mcp_servers(namespace=ws_prefix, servers_toml_path=ws_servers_toml):
-            decision = check_mcp_server_trust(
-                pkg_key=WORKSPACE_TRUST_KEY,
-                integrity=None,
-                fqid=s.fqid,
-                needs_exec=s.transport == "stdio",
-                needs_mcp=s.transport != "stdio",
-            )
-            if not decision.ok:
-                blocked.append(decision.reason or f"{WORKSPACE_TRUST_KEY}: not trusted for {s.fqid}")
-                continue
-            servers.append(
-                {
-                    "id": _home_id_for_fqid(s.fqid),
-                    "transport": s.transport,
-                    "command": s.command,
-                    "args": s.args,
-                    "url": s.url,
-                    "env": s.env,
-                }
-            )
+            candidates.append((WORKSPACE_TRUST_KEY, None, s))
 
     lock_path = default_lock_path()
     if lock_path.exists():
@@ -151,26 +198,38 @@ def _try_collect_project_servers() -> tuple[list[dict[str, object]], list[str]]:
                 if not servers_toml.exists():
                     continue
                 for s in build_mcp_servers(namespace=pkg_name, servers_toml_path=servers_toml):
-                    decision = check_mcp_server_trust(
-                        pkg_key=pkg_key,
-                        integrity=pkg.integrity,
-                        fqid=s.fqid,
-                        needs_exec=s.transport == "stdio",
-                        needs_mcp=s.transport != "stdio",
-                    )
-                    if not decision.ok:
-                        blocked.append(decision.reason or f"{pkg_key}: not trusted for {s.fqid}")
-                        continue
-                    servers.append(
-                        {
-                            "id": _home_id_for_fqid(s.fqid),
-                            "transport": s.transport,
-                            "command": s.command,
-                            "args": s.args,
-                            "url": s.url,
-                            "env": s.env,
-                        }
-                    )
+                    candidates.append((pkg_key, pkg.integrity, s))
+
+    if not candidates:
+        return ([], [], ws_servers_toml)
+    decisions = check_trust_batch(
+        [
+            TrustRequest(
+                pkg_key=pkg_key,
+                integrity=integrity,
+                needs_exec=s.transport == "stdio",
+                needs_mcp=s.transport != "stdio",
+                fqid=s.fqid,
+            )
+            for pkg_key, integrity, s in candidates
+        ]
+    )
+
+    servers: list[dict[str, object]] = []
+    for (pkg_key, _integrity, s), decision in zip(candidates, decisions):
+        if not decision.ok:
+            blocked.append(decision.reason or f"{pkg_key}: not trusted for {s.fqid}")
+            continue
+        servers.append(
+            {
+                "id": _home_id_for_fqid(s.fqid),
+                "transport": s.transport,
+                "command": s.command,
+                "args": s.args,
+                "url": s.url,
+                "env": s.env,
+            }
+        )
 
     # Deterministic output + id collision defense.
     servers.sort(key=lambda x: str(x.get("id")))
@@ -178,11 +237,12 @@ def _try_collect_project_servers() -> tuple[list[dict[str, object]], list[str]]:
     for s in servers:
         sid = str(s["id"])
         if sid in seen:
-            # Disambiguate deterministically.
-            s["id"] = sid + "--" + _sha256_json(s)[0:8]
-        seen.add(str(s["id"]))
+            # Disambiguate deterministically; only collisions pay for hashing.
+            sid = sid + "--" + _sha256_json(s)[0:8]
+            s["id"] = sid
+        seen.add(sid)
 
-    return (servers, blocked)
+    return (servers, blocked, ws_servers_toml)
 
 
 HomeTui = Literal["codex", "coder", "amp"]
@@ -202,22 +262,35 @@ def _sha256_text(s: str) -> str:
 
 def _state_dir() -> Path:
     # Allow tests / power-users to override.
-    override = os.environ.get("BOTPACK_HOME_STATE_DIR")
+    return _resolve_state_dir(os.environ.get("BOTPACK_HOME_STATE_DIR") or "", str(Path.home()))
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_state_dir(override: str, home: str) -> Path:
+    # Keyed on the inputs, so env changes (e.g. monkeypatched tests) need no cache_clear.
     if override:
         return Path(override).expanduser().resolve()
-    return (Path.home() / ".botpack" / "state").resolve()
+    return (Path(home) / ".botpack" / "state").resolve()
 
 
 def _state_path() -> Path:
     return _state_dir() / "home-config.json"
 
 
+def _read_bytes_or_none(p: Path) -> bytes | None:
+    # One open instead of exists() + read; a missing file is the common first-run case.
+    try:
+        return p.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
 def _load_state() -> dict:
-    p = _state_path()
-    if not p.exists():
+    raw = _read_bytes_or_none(_state_path())
+    if raw is None:
         return {"version": 1, "paths": {}}
     try:
-        data = json.loads(p.read_text(encoding="utf-8"))
+        data = loads_json(raw)
         if not isinstance(data, dict):
             return {"version": 1, "paths": {}}
         if data.get("version") != 1:
@@ -229,14 +302,24 @@ def _load_state() -> dict:
         return {"version": 1, "paths": {}}
 
 
+def _update_path_state(state: dict, cfg_path: Path, entry: dict[str, object], *, now: str, dry_run: bool) -> None:
+    """Record `entry` for `cfg_path`; no write when only updated_at would change."""
+
+    paths_state = state.get("paths") or {}
+    prev = paths_state.get(str(cfg_path))
+    if isinstance(prev, dict) and {k: v for k, v in prev.items() if k != "updated_at"} == entry:
+        return
+    paths_state[str(cfg_path)] = {**entry, "updated_at": now}
+    state["paths"] = paths_state
+    _write_state(state, dry_run=dry_run)
+
+
 def _write_state(state: dict, *, dry_run: bool) -> None:
     if dry_run:
         return
     p = _state_path()
     p.parent.mkdir(parents=True, exist_ok=True)
-    tmp = p.with_suffix(p.suffix + ".tmp")
-    tmp.write_text(json.dumps(state, sort_keys=True, indent=2) + "\n", encoding="utf-8")
-    tmp.replace(p)
+    atomic_write_bytes(p, dump_json_bytes(state))
 
 
 def default_home_config_path(tui: HomeTui) -> Path:
@@ -279,26 +362,38 @@ class ApplyResult:
     dry_run: bool = False
 
 
+def _find_line(text: str, line: str, start: int = 0, *, strip: bool = False) -> tuple[int, int] | None:
+    """Locate the first line at/after `start` equal to `line` (ignoring surrounding whitespace if `strip`).
+
+    Returns (line start, line end including its newline), or None.
+    """
+
+    n = len(line)
+    i = text.find(line, start)
+    while i >= 0:
+        ls = text.rfind("\n", 0, i) + 1
+        nl = text.find("\n", i + n)
+        le = len(text) if nl < 0 else nl
+        head, tail = text[ls:i], text[i + n : le]
+        if (not head and not tail) or (strip and not head.strip() and not tail.strip()):
+            return (ls, le if nl < 0 else le + 1)
+        i = text.find(line, i + 1)
+    return None
+
+
 def _extract_managed_block(text: str) -> tuple[str | None, str | None, str | None]:
     """Return (prefix, inner, suffix) if markers exist, else (None, None, None)."""
 
-    lines = text.splitlines(keepends=True)
-    b = None
-    e = None
-    for i, ln in enumerate(lines):
-        if ln.rstrip("\n") == BEGIN_MARKER:
-            b = i
-            continue
-        if ln.rstrip("\n") == END_MARKER and b is not None:
-            e = i
-            break
-    if b is None or e is None or e <= b:
+    b = _find_line(text, BEGIN_MARKER)
+    if b is None:
         return (None, None, None)
-
-    prefix = "".join(lines[:b])
-    inner = "".join(lines[b + 1 : e])
-    suffix = "".join(lines[e + 1 :])
-    return (prefix, inner, suffix)
+    e = _find_line(text, END_MARKER, b[1])
+    if e is None:
+        return (None, None, None)
+    # A repeated BEGIN before the END restarts the block.
+    while (nb := _find_line(text, BEGIN_MARKER, b[1])) is not None and nb[0] < e[0]:
+        b = nb
+    return (text[: b[0]], text[b[1] : e[0]], text[e[1] :])
 
 
 def _render_managed_block(inner: str) -> str:
@@ -306,34 +401,62 @@ def _render_managed_block(inner: str) -> str:
     return BEGIN_MARKER + "\n" + body + END_MARKER + "\n"
 
 
-def _toml_has_section(text: str, section: str) -> bool:
-    hdr = f"[{section}]"
-    return any(ln.strip() == hdr for ln in text.splitlines())
+def _next_toml_header(text: str, start: int) -> int:
+    """Start of the next `[..]` header line at column 0 at/after `start`, else len(text)."""
+
+    n = len(text)
+    i = start
+    while i < n:
+        if text[i] == "[":
+            nl = text.find("\n", i)
+            if text[i : n if nl < 0 else nl].endswith("]"):
+                return i
+        j = text.find("\n[", i)
+        if j < 0:
+            return n
+        i = j + 1
+    return n
 
 
 def _remove_toml_section(text: str, section: str) -> str:
     """Remove a TOML section like [mcp_servers.mcp-magic-number] until next [..] header."""
 
-    lines = text.splitlines(keepends=True)
     hdr = f"[{section}]"
     out: list[str] = []
-    i = 0
-    while i < len(lines):
-        ln = lines[i]
-        if ln.strip() == hdr:
-            # Skip until next header at column 0 (best-effort).
-            i += 1
-            while i < len(lines):
-                nxt = lines[i]
-                if nxt.startswith("[") and nxt.rstrip("\n").endswith("]"):
-                    break
-                i += 1
-            continue
-        out.append(ln)
-        i += 1
+    pos = 0
+    while (hit := _find_line(text, hdr, pos, strip=True)) is not None:
+        out.append(text[pos : hit[0]])
+        # Skip until next header at column 0 (best-effort).
+        pos = _next_toml_header(text, hit[1])
+    out.append(text[pos:])
     return "".join(out)
 
 
+def _reuse_last_apply(entry: object, file_sha: str | None, desired_token: str, *, force: bool) -> list[str] | None:
+    """Skipped ids from the last apply if the file bytes and desired servers still match it, else None."""
+
+    if force or file_sha is None or not isinstance(entry, dict):
+        return None
+    if entry.get("file_sha256") != file_sha or entry.get("desired_sha256") != desired_token:
+        return None
+    skipped = entry.get("skipped")
+    return skipped if isinstance(skipped, list) else []
+
+
+def _decode_text(raw: bytes) -> str:
+    # Same result as Path.read_text(encoding="utf-8"): universal newlines.
+    return raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _skip_message(blocked: list[str], skipped_existing: list[str]) -> str:
+    msg_parts: list[str] = []
+    if blocked:
+        msg_parts.append(f"skipped {len(blocked)} untrusted project MCP server(s)")
+    if skipped_existing:
+        msg_parts.append(f"skipped {len(skipped_existing)} already-configured server(s)")
+    return "; ".join(msg_parts)
+
+
 def apply_mcp_magic_number_home_config(
     *,
     tui: HomeTui,
@@ -354,6 +477,7 @@ def apply_mcp_magic_number_home_config(
     """
 
     cfg_path = (path or default_home_config_path(tui)).expanduser().resolve()
+    now = _ts_utc()
 
     # Desired servers: always include the bundled magic-number server, plus best-effort project-derived servers.
     desired_servers = [_builtin_magic_server()]
@@ -371,25 +495,34 @@ def apply_mcp_magic_number_home_config(
         entry = paths_state.get(str(cfg_path))
         prev_sha = entry.get("managed_sha256") if isinstance(entry, dict) else None
 
-        current_text = cfg_path.read_text(encoding="utf-8") if cfg_path.exists() else ""
+        raw = _read_bytes_or_none(cfg_path)
+        file_sha = hashlib.sha256(raw).hexdigest() if raw is not None else None
+        desired_token = _sha256_json(desired_servers)
+        skipped = _reuse_last_apply(entry, file_sha, desired_token, force=force)
+        if skipped is not None:
+            # Unchanged since the last apply: skip decoding and scanning the file.
+            return ApplyResult(ok=True, changed=False, status="ok", path=cfg_path, message=_skip_message(blocked, skipped), dry_run=dry_run)
+
+        current_text = _decode_text(raw) if raw is not None else ""
         prefix, inner, suffix = _extract_managed_block(current_text)
 
         outside_text = (prefix or "") + (suffix or "") if inner is not None else current_text
+        # Header lines outside the managed block, collected once for O(1) lookups per server.
+        outside_headers = {h for ln in outside_text.splitlines() if (h := ln.strip()).startswith("[") and h.endswith("]")}
         prefix2 = prefix or ""
         suffix2 = suffix or ""
         current_text2 = current_text
 
         for s in desired_servers:
             section = f"mcp_servers.{s['id']}"
-            if _toml_has_section(outside_text, section):
+            if f"[{section}]" in outside_headers:
                 if force:
                     if inner is not None:
                         prefix2 = _remove_toml_section(prefix2, section)
                         suffix2 = _remove_toml_section(suffix2, section)
-                        outside_text = prefix2 + suffix2
                     else:
                         current_text2 = _remove_toml_section(current_text2, section)
-                        outside_text = current_text2
+                    outside_headers.discard(f"[{section}]")
                     servers_to_manage.append(s)
                 else:
                     skipped_existing.append(str(s["id"]))
@@ -435,26 +568,27 @@ def apply_mcp_magic_number_home_config(
         bp = _maybe_backup(cfg_path, backup=backup, dry_run=dry_run) if changed else None
         if changed and not dry_run:
             cfg_path.parent.mkdir(parents=True, exist_ok=True)
-            tmp = cfg_path.with_name(cfg_path.name + ".tmp")
-            tmp.write_text(new_text, encoding="utf-8")
-            tmp.replace(cfg_path)
-
-        # Update state even if no-op; it stabilizes drift detection.
-        paths_state[str(cfg_path)] = {
-            "tui": tui,
-            "kind": "toml-managed-block",
-            "managed_sha256": desired_sha,
-            "updated_at": _ts_utc(),
-        }
-        prev_state["paths"] = paths_state
-        _write_state(prev_state, dry_run=dry_run)
-
-        msg_parts: list[str] = []
-        if blocked:
-            msg_parts.append(f"skipped {len(blocked)} untrusted project MCP server(s)")
-        if skipped_existing:
-            msg_parts.append(f"skipped {len(skipped_existing)} already-configured server(s)")
-        msg = "; ".join(msg_parts)
+            data = new_text.encode("utf-8")
+            atomic_write_bytes(cfg_path, data)
+            file_sha = hashlib.sha256(data).hexdigest()
+
+        # Record state even if no-op; it stabilizes drift detection.
+        _update_path_state(
+            prev_state,
+            cfg_path,
+            {
+                "tui": tui,
+                "kind": "toml-managed-block",
+                "managed_sha256": desired_sha,
+                "file_sha256": file_sha,
+                "desired_sha256": desired_token,
+                "skipped": skipped_existing,
+            },
+            now=now,
+            dry_run=dry_run,
+        )
+
+        msg = _skip_message(blocked, skipped_existing)
         return ApplyResult(ok=True, changed=changed, status="ok", path=cfg_path, message=msg, backup_path=bp, dry_run=dry_run)
 
     # amp (JSON)
@@ -478,13 +612,21 @@ def apply_mcp_magic_number_home_config(
     paths_state = prev_state.get("paths") or {}
     entry_state = paths_state.get(str(cfg_path)) if isinstance(paths_state, dict) else None
     prev_servers = entry_state.get("servers") if isinstance(entry_state, dict) else {}
-    if not isinstance(prev_servers, dict):
-        prev_servers = {}
+    # Copy: the loaded entry is compared against the updated one before writing state.
+    prev_servers = dict(prev_servers) if isinstance(prev_servers, dict) else {}
+    desired_token = _sha256_json(desired_map)
 
     try:
         current_obj: dict[str, Any] = {}
-        if cfg_path.exists():
-            loaded = json.loads(cfg_path.read_text(encoding="utf-8"))
+        raw = _read_bytes_or_none(cfg_path)
+        file_sha = hashlib.sha256(raw).hexdigest() if raw is not None else None
+        skipped = _reuse_last_apply(entry_state, file_sha, desired_token, force=force)
+        if skipped is not None:
+            # Same bytes and same desired servers as the last apply: the full pass
+            # would reach the same no-op result, so skip parsing settings.json.
+            return ApplyResult(ok=True, changed=False, status="ok", path=cfg_path, message=_skip_message(blocked, skipped), dry_run=dry_run)
+        if raw is not None:
+            loaded = loads_json(raw)
             if isinstance(loaded, dict):
                 current_obj = loaded
             else:
@@ -497,10 +639,12 @@ def apply_mcp_magic_number_home_config(
                     dry_run=dry_run,
                 )
 
+        changed = False
         amp = current_obj.get("amp")
         if amp is None:
             amp = {}
             current_obj["amp"] = amp
+            changed = True
         if not isinstance(amp, dict):
             return ApplyResult(
                 ok=False,
@@ -515,6 +659,7 @@ def apply_mcp_magic_number_home_config(
         if mcp_servers is None:
             mcp_servers = {}
             amp["mcpServers"] = mcp_servers
+            changed = True
         if not isinstance(mcp_servers, dict):
             return ApplyResult(
                 ok=False,
@@ -525,14 +670,21 @@ def apply_mcp_magic_number_home_config(
                 dry_run=dry_run,
             )
 
-        original = json.loads(json.dumps(current_obj))  # cheap deep copy
         skipped_existing: list[str] = []
 
+        # Hash each desired entry once; an on-disk entry equal to it shares the hash.
+        desired_shas = {sid: _sha256_json(e) for sid, e in desired_map.items()}
+
         # Apply/update managed servers.
         for sid, desired_entry in desired_map.items():
             cur = mcp_servers.get(sid)
-            desired_sha = _sha256_json(desired_entry)
-            cur_sha = _sha256_json(cur) if cur is not None else None
+            desired_sha = desired_shas[sid]
+            if cur is None:
+                cur_sha = None
+            elif cur == desired_entry:
+                cur_sha = desired_sha
+            else:
+                cur_sha = _sha256_json(cur)
             prev_sha = prev_servers.get(sid)
 
             # Avoid clobbering user-managed entries: if the key exists and we
@@ -565,7 +717,9 @@ def apply_mcp_magic_number_home_config(
                     dry_run=dry_run,
                 )
 
-            mcp_servers[sid] = desired_entry
+            if cur_sha != desired_sha:
+                mcp_servers[sid] = desired_entry
+                changed = True
             prev_servers[sid] = desired_sha
 
         # Remove servers we previously managed but no longer desire.
@@ -589,31 +743,31 @@ def apply_mcp_magic_number_home_config(
                 )
             mcp_servers.pop(sid, None)
             prev_servers.pop(sid, None)
+            changed = True
 
-        changed = _canonical_json(original) != _canonical_json(current_obj)
         bp = _maybe_backup(cfg_path, backup=backup, dry_run=dry_run) if changed else None
         if changed and not dry_run:
             cfg_path.parent.mkdir(parents=True, exist_ok=True)
-            tmp = cfg_path.with_name(cfg_path.name + ".tmp")
-            tmp.write_text(json.dumps(current_obj, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-            tmp.replace(cfg_path)
-
-        paths_state[str(cfg_path)] = {
-            "tui": tui,
-            "kind": "json-managed-mcpServers",
-            "servers": prev_servers,
-            "updated_at": _ts_utc(),
-        }
-        prev_state["paths"] = paths_state
-        _write_state(prev_state, dry_run=dry_run)
-
-        msg = ""
-        msg_parts: list[str] = []
-        if blocked:
-            msg_parts.append(f"skipped {len(blocked)} untrusted project MCP server(s)")
-        if skipped_existing:
-            msg_parts.append(f"skipped {len(skipped_existing)} already-configured server(s)")
-        msg = "; ".join(msg_parts)
+            data = (_SETTINGS_ENCODER.encode(current_obj) + "\n").encode("utf-8")
+            atomic_write_bytes(cfg_path, data)
+            file_sha = hashlib.sha256(data).hexdigest()
+
+        _update_path_state(
+            prev_state,
+            cfg_path,
+            {
+                "tui": tui,
+                "kind": "json-managed-mcpServers",
+                "servers": prev_servers,
+                "file_sha256": file_sha,
+                "desired_sha256": desired_token,
+                "skipped": skipped_existing,
+            },
+            now=now,
+            dry_run=dry_run,
+        )
+
+        msg = _skip_message(blocked, skipped_existing)
         return ApplyResult(ok=True, changed=changed, status="ok", path=cfg_path, message=msg, backup_path=bp, dry_run=dry_run)
 
     except Exception as e:
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import json
+import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Literal
 
+from ..fileio import atomic_write_bytes
+
 
 MatrixStatus = Literal["PASS", "FAIL", "PARTIAL", "N/A", "BLOCKED"]
 
@@ -50,7 +53,10 @@ class MatrixRun:
     def _results_path(self) -> Path:
         return self.run_dir / "results.json"
 
-    def record(
+    def _log_path(self) -> Path:
+        return self.run_dir / "entries.jsonl"
+
+    def append(
         self,
         *,
         tui: str,
@@ -60,28 +66,71 @@ class MatrixRun:
         artifacts: str = "",
         notes: str = "",
     ) -> None:
+        """Log one entry without touching results.json; `finalize()` folds the log in."""
+
+        entry = {
+            "at": _ts_utc(),
+            "tui": tui,
+            "feature": feature,
+            "status": status,
+            "evidence": evidence,
+            "artifacts": artifacts,
+            "notes": notes,
+        }
+        with self._log_path().open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, sort_keys=True) + "\n")
+
+    def finalize(self) -> None:
+        """Append logged entries to results.json (one rewrite) and drop the log.
+
+        The log is first renamed to `entries.<token>.merging`, and results.json
+        records the token it merged, so a retry after a crash neither loses nor
+        re-applies entries.
+        """
+
+        pending = sorted(self.run_dir.glob("entries.*.merging"), key=lambda q: q.stat().st_mtime_ns)
+        log = self._log_path()
+        if not pending and not log.exists():
+            return
+        data = self._load_results()
+        if log.exists():
+            merging = self.run_dir / f"entries.{uuid.uuid4().hex}.merging"
+            log.replace(merging)
+            pending.append(merging)
+        for merging in pending:
+            token = merging.name[len("entries.") : -len(".merging")]
+            if data.get("merged_log") != token:
+                data["entries"].extend(json.loads(ln) for ln in merging.read_bytes().splitlines() if ln.strip())
+                data["merged_log"] = token
+                atomic_write_bytes(self._results_path(), (json.dumps(data, sort_keys=True, indent=2) + "\n").encode("utf-8"))
+            merging.unlink()
+
+    def _load_results(self) -> dict:
         p = self._results_path()
-        if not p.exists():
-            raise FileNotFoundError(str(p))
-        data = json.loads(p.read_text(encoding="utf-8"))
+        try:
+            raw = p.read_bytes()
+        except FileNotFoundError:
+            raise FileNotFoundError(str(p)) from None
+        data = json.loads(raw)
         if not isinstance(data, dict):
             raise ValueError("results.json: expected object")
-        entries = data.get("entries")
-        if not isinstance(entries, list):
+        if not isinstance(data.get("entries"), list):
             raise ValueError("results.json: entries must be a list")
-        entries.append(
-            {
-                "at": _ts_utc(),
-                "tui": tui,
-                "feature": feature,
-                "status": status,
-                "evidence": evidence,
-                "artifacts": artifacts,
-                "notes": notes,
-            }
-        )
-        data["entries"] = entries
+        return data
 
-        tmp = p.with_suffix(".json.tmp")
-        tmp.write_text(json.dumps(data, sort_keys=True, indent=2) + "\n", encoding="utf-8")
-        tmp.replace(p)
+    def record(
+        self,
+        *,
+        tui: str,
+        feature: str,
+        status: MatrixStatus,
+        evidence: str = "",
+        artifacts: str = "",
+        notes: str = "",
+    ) -> None:
+        # Fail before logging anything: a stray entry would be merged into whatever
+        # results.json shows up later.
+        if not self._results_path().exists():
+            raise FileNotFoundError(str(self._results_path()))
+        self.append(tui=tui, feature=feature, status=status, evidence=evidence, artifacts=artifacts, notes=notes)
+        self.finalize()
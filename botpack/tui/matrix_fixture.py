@@ -35,11 +35,24 @@ def write_fixture_project(
     """
 
     root = root.resolve()
-    root.mkdir(parents=True, exist_ok=True)
-
-    # botpack.toml
-    (root / "botpack.toml").write_text(
-        (
+    made: set[Path] = set()
+    for rel, content in _fixture_files(python_exe=python_exe, spec=spec).items():
+        path = root / rel
+        # mkdir at most once per directory; parents=True covers intermediate ones.
+        if path.parent not in made:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            made.add(path.parent)
+        path.write_bytes(content.encode("utf-8"))
+
+
+def _fixture_files(*, python_exe: str, spec: FixtureSpec) -> dict[Path, str]:
+    """Relative path -> text for every fixture file, in write order."""
+
+    ws = Path(".botpack") / "workspace"
+    pkg_root = spec.pkg_relpath
+    return {
+        # botpack.toml
+        Path("botpack.toml"): (
             "version = 1\n\n"
             "[workspace]\n"
             "dir = \".botpack/workspace\"\n"
@@ -49,14 +62,8 @@ def write_fixture_project(
             "[sync]\n"
             "linkMode = \"auto\"\n"
         ),
-        encoding="utf-8",
-    )
-
-    # trust.toml (trust workspace + package servers)
-    trust = root / ".botpack" / "trust.toml"
-    trust.parent.mkdir(parents=True, exist_ok=True)
-    trust.write_text(
-        (
+        # trust.toml (trust workspace + package servers)
+        Path(".botpack") / "trust.toml": (
             "version = 1\n\n"
             "[__workspace__]\n"
             "allowExec = true\n"
@@ -65,16 +72,8 @@ def write_fixture_project(
             "allowExec = true\n"
             "allowMcp = true\n"
         ),
-        encoding="utf-8",
-    )
-
-    ws = root / ".botpack" / "workspace"
-
-    # Workspace skill
-    skill_dir = ws / "skills" / "fixture-skill"
-    (skill_dir / "scripts").mkdir(parents=True, exist_ok=True)
-    (skill_dir / "SKILL.md").write_text(
-        (
+        # Workspace skill
+        ws / "skills" / "fixture-skill" / "SKILL.md": (
             "---\n"
             "id: fixture-skill\n"
             "name: Fixture Skill\n"
@@ -82,37 +81,19 @@ def write_fixture_project(
             "---\n\n"
             "This is a fixture skill.\n"
         ),
-        encoding="utf-8",
-    )
-    (skill_dir / "scripts" / "hello.py").write_text(
-        (
+        ws / "skills" / "fixture-skill" / "scripts" / "hello.py": (
             "# /// script\n"
             "# requires-python = \">=3.10\"\n"
             "# dependencies = []\n"
             "# ///\n"
             "print('fixture-skill:hello')\n"
         ),
-        encoding="utf-8",
-    )
-
-    # Workspace command
-    (ws / "commands").mkdir(parents=True, exist_ok=True)
-    (ws / "commands" / "hello.md").write_text(
-        "# hello\n\nThis is a deterministic fixture command.\n",
-        encoding="utf-8",
-    )
-
-    # Workspace agent
-    (ws / "agents").mkdir(parents=True, exist_ok=True)
-    (ws / "agents" / "echo.md").write_text(
-        "# echo\n\nEcho agent fixture.\n",
-        encoding="utf-8",
-    )
-
-    # Workspace MCP
-    (ws / "mcp").mkdir(parents=True, exist_ok=True)
-    (ws / "mcp" / "servers.toml").write_text(
-        (
+        # Workspace command
+        ws / "commands" / "hello.md": "# hello\n\nThis is a deterministic fixture command.\n",
+        # Workspace agent
+        ws / "agents" / "echo.md": "# echo\n\nEcho agent fixture.\n",
+        # Workspace MCP
+        ws / "mcp" / "servers.toml": (
             "version = 1\n\n"
             "[[server]]\n"
             "id = \"magic-number\"\n"
@@ -120,14 +101,8 @@ def write_fixture_project(
             f"command = \"{python_exe}\"\n"
             "args = [\"-m\", \"botpack.mcp_magic_number_server\"]\n"
         ),
-        encoding="utf-8",
-    )
-
-    # Package dependency
-    pkg_root = root / spec.pkg_relpath
-    pkg_root.mkdir(parents=True, exist_ok=True)
-    (pkg_root / "agentpkg.toml").write_text(
-        (
+        # Package dependency
+        pkg_root / "agentpkg.toml": (
             'agentpkg = "0.1"\n'
             f'name = "{spec.pkg_name}"\n'
             f'version = "{spec.pkg_version}"\n'
@@ -136,13 +111,8 @@ def write_fixture_project(
             "exec = true\n"
             "mcp = true\n"
         ),
-        encoding="utf-8",
-    )
-
-    # Package assets
-    (pkg_root / "skills" / "pkg-skill" / "scripts").mkdir(parents=True, exist_ok=True)
-    (pkg_root / "skills" / "pkg-skill" / "SKILL.md").write_text(
-        (
+        # Package assets
+        pkg_root / "skills" / "pkg-skill" / "SKILL.md": (
             "---\n"
             "id: pkg-skill\n"
             "name: Package Skill\n"
@@ -150,28 +120,10 @@ def write_fixture_project(
             "---\n\n"
             "Package skill.\n"
         ),
-        encoding="utf-8",
-    )
-    (pkg_root / "skills" / "pkg-skill" / "scripts" / "pkg_hello.py").write_text(
-        "print('pkg-skill:hello')\n",
-        encoding="utf-8",
-    )
-
-    (pkg_root / "commands").mkdir(parents=True, exist_ok=True)
-    (pkg_root / "commands" / "pkg-hello.md").write_text(
-        "# pkg-hello\n\nFixture package command.\n",
-        encoding="utf-8",
-    )
-
-    (pkg_root / "agents").mkdir(parents=True, exist_ok=True)
-    (pkg_root / "agents" / "pkg-agent.md").write_text(
-        "# pkg-agent\n\nFixture package agent.\n",
-        encoding="utf-8",
-    )
-
-    (pkg_root / "mcp").mkdir(parents=True, exist_ok=True)
-    (pkg_root / "mcp" / "servers.toml").write_text(
-        (
+        pkg_root / "skills" / "pkg-skill" / "scripts" / "pkg_hello.py": "print('pkg-skill:hello')\n",
+        pkg_root / "commands" / "pkg-hello.md": "# pkg-hello\n\nFixture package command.\n",
+        pkg_root / "agents" / "pkg-agent.md": "# pkg-agent\n\nFixture package agent.\n",
+        pkg_root / "mcp" / "servers.toml": (
             "version = 1\n\n"
             "[[server]]\n"
             "id = \"pkg-magic-number\"\n"
@@ -179,5 +131,4 @@ def write_fixture_project(
             f"command = \"{python_exe}\"\n"
             "args = [\"-m\", \"botpack.mcp_magic_number_server\"]\n"
         ),
-        encoding="utf-8",
-    )
+    }
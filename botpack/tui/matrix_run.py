@@ -181,8 +181,12 @@ def run_matrix(cfg: RunConfig) -> Path:
     wheel_dir = run_dir / "_wheel"
     wheel = _build_wheel(out_dir=wheel_dir, dry_run=cfg.dry_run)
 
-    for tui in cfg.tuis:
-        _run_tui(mr=mr, run_dir=run_dir, tui=tui, wheel=wheel, dry_run=cfg.dry_run)
+    try:
+        for tui in cfg.tuis:
+            _run_tui(mr=mr, run_dir=run_dir, tui=tui, wheel=wheel, dry_run=cfg.dry_run)
+    finally:
+        # Entries are logged as they happen and folded into results.json once.
+        mr.finalize()
 
     return run_dir
 
@@ -197,7 +201,7 @@ def _record(
     artifacts: str = "",
     notes: str = "",
 ) -> None:
-    mr.record(tui=tui, feature=feature, status=status, evidence=evidence, artifacts=artifacts, notes=notes)
+    mr.append(tui=tui, feature=feature, status=status, evidence=evidence, artifacts=artifacts, notes=notes)
 
 
 def _run_tui(*, mr: MatrixRun, run_dir: Path, tui: TuiName, wheel: Path, dry_run: bool) -> None:
@@ -5,7 +5,7 @@ from pathlib import Path
 
 from .lock import load_lock
 from .paths import store_dir
-from .store import tree_digest
+from .store import digest_algo, tree_digest
 
 
 @dataclass(frozen=True)
@@ -26,7 +26,11 @@ def verify_lockfile(*, lock_path: Path) -> VerifyResult:
         if not entry.exists():
             errs.append(f"{key}: missing store entry {pkg.integrity}")
             continue
-        actual = tree_digest(entry)
+        try:
+            actual = tree_digest(entry, algo=digest_algo(pkg.integrity))
+        except ValueError as e:
+            errs.append(f"{key}: {e}")
+            continue
         if actual != pkg.integrity:
             errs.append(f"{key}: integrity mismatch (lock={pkg.integrity}, store={actual})")
 
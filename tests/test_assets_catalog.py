@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
 from botpack.assets import scan_assets
@@ -164,3 +165,15 @@ description: Says hello.
     )
 
     assert out.read_text(encoding="utf-8") == expected
+
+
+def test_scan_assets_rereads_skill_after_edit(tmp_path: Path) -> None:
+    skill_md = tmp_path / "skills" / "hello" / "SKILL.md"
+    skill_md.parent.mkdir(parents=True)
+    skill_md.write_text("---\nname: one\n---\n", encoding="utf-8")
+    os.utime(skill_md, ns=(1_000_000_000, 1_000_000_000))
+    assert scan_assets(tmp_path).skills[0].title == "one"
+
+    skill_md.write_text("---\nname: two\n---\n", encoding="utf-8")
+    os.utime(skill_md, ns=(2_000_000_000, 2_000_000_000))
+    assert scan_assets(tmp_path).skills[0].title == "two"
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+import errno
+import hashlib
+import os
+import time
 from pathlib import Path
 
-from botpack.sync import sync
+import pytest
+
+import botpack.fileio as fileio_mod
+import botpack.paths as paths_mod
+import botpack.sync as sync_mod
+from botpack.sync import _sha256_file_cached, sync
 from botpack.lock import Lockfile, Package, save_lock
 from botpack.store import store_put_tree
 
@@ -163,3 +172,193 @@ dir = ".botpack/workspace"
     res3 = sync(target="claude", manifest_path=tmp_path / "botpack.toml", force=True)
     assert res3.conflicts == []
     assert out_cmd.read_text(encoding="utf-8") == "hi"
+
+
+def test_sha256_file_cache_tracks_file_identity(tmp_path: Path) -> None:
+    p = tmp_path / "a.md"
+    p.write_text("aaa", encoding="utf-8")
+    os.utime(p, ns=(1_000_000_000, 1_000_000_000))
+    assert _sha256_file_cached(p) == hashlib.sha256(b"aaa").hexdigest()
+
+    # Same size, different mtime: must re-hash.
+    p.write_text("bbb", encoding="utf-8")
+    os.utime(p, ns=(2_000_000_000, 2_000_000_000))
+    assert _sha256_file_cached(p) == hashlib.sha256(b"bbb").hexdigest()
+
+
+def test_publish_anonymous_stops_after_unsupported_linkat(tmp_path: Path, monkeypatch) -> None:
+    if fileio_mod._O_TMPFILE is None:
+        pytest.skip("O_TMPFILE not available")
+    monkeypatch.setattr(fileio_mod, "_link_tmpfile_ok", True)
+
+    def _exdev(*args: object, **kwargs: object) -> None:
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(fileio_mod.os, "link", _exdev)
+    fills: list[int] = []
+    assert fileio_mod.publish_anonymous(tmp_path / "a.md", fills.append) is False
+    assert fileio_mod.publish_anonymous(tmp_path / "b.md", fills.append) is False
+    # Only the first attempt filled an unnamed inode.
+    assert len(fills) == 1
+    assert fileio_mod._link_tmpfile_ok is False
+
+
+def _init_project(tmp_path: Path, monkeypatch, *, text: str = "hi") -> tuple[Path, Path, Path]:
+    """Workspace project with one command `hi.md`; returns (manifest, source, claude output)."""
+
+    monkeypatch.setenv("BOTPACK_ROOT", str(tmp_path))
+    manifest = tmp_path / "botpack.toml"
+    manifest.write_text(
+        """version = 1
+
+[workspace]
+dir = ".botpack/workspace"
+""",
+        encoding="utf-8",
+    )
+    cmd_dir = tmp_path / ".botpack" / "workspace" / "commands"
+    cmd_dir.mkdir(parents=True)
+    src = cmd_dir / "hi.md"
+    src.write_text(text, encoding="utf-8")
+    return manifest, src, tmp_path / ".claude" / "commands" / "workspace.hi.md"
+
+
+def test_sync_does_not_rewrite_unchanged_state(tmp_path: Path, monkeypatch) -> None:
+    manifest, _, _ = _init_project(tmp_path, monkeypatch)
+
+    sync(target="claude", manifest_path=manifest)
+    state = tmp_path / ".botpack" / "state" / "sync-claude.json"
+    ino = state.stat().st_ino
+
+    sync(target="claude", manifest_path=manifest)
+    assert state.stat().st_ino == ino
+
+
+def test_sync_warm_run_skips_hashing_unchanged_files(tmp_path: Path, monkeypatch) -> None:
+    manifest, _, _ = _init_project(tmp_path, monkeypatch)
+
+    # Disable the racy window so fingerprints get recorded right away.
+    monkeypatch.setattr(paths_mod, "RACY_WINDOW_NS", 0)
+    sync(target="claude", manifest_path=manifest)
+    sync(target="claude", manifest_path=manifest)
+
+    def _boom(path: Path) -> str:
+        raise AssertionError(f"unexpected hash of {path}")
+
+    monkeypatch.setattr(sync_mod, "_sha256_file", _boom)
+    sync_mod._sha256_file_by_identity.cache_clear()
+    res = sync(target="claude", manifest_path=manifest)
+    assert res.created == [] and res.updated == [] and res.conflicts == []
+
+
+def test_sync_detects_same_size_rewrite_with_restored_mtime(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(paths_mod, "RACY_WINDOW_NS", 0)
+    manifest, src, out_cmd = _init_project(tmp_path, monkeypatch, text="aa")
+
+    sync(target="claude", manifest_path=manifest)
+    before = src.stat()
+
+    # Like `cp -p`: same size, mtime restored. Let the ctime clock tick first.
+    time.sleep(0.05)
+    src.write_text("bb", encoding="utf-8")
+    os.utime(src, ns=(before.st_atime_ns, before.st_mtime_ns))
+
+    res = sync(target="claude", manifest_path=manifest)
+    assert res.updated == [str(out_cmd)]
+    assert out_cmd.read_text(encoding="utf-8") == "bb"
+
+
+def _synced_edit_with_restored_mtime(tmp_path: Path, monkeypatch) -> tuple[Path, Path, Path]:
+    """Sync `aa` twice (recording dst_fp), then edit the output keeping size and mtime."""
+
+    monkeypatch.setattr(paths_mod, "RACY_WINDOW_NS", 0)
+    manifest, src, out_cmd = _init_project(tmp_path, monkeypatch, text="aa")
+    sync(target="claude", manifest_path=manifest)
+    sync(target="claude", manifest_path=manifest)
+    before = out_cmd.stat()
+
+    time.sleep(0.05)
+    out_cmd.write_text("XY", encoding="utf-8")
+    os.utime(out_cmd, ns=(before.st_atime_ns, before.st_mtime_ns))
+    return manifest, src, out_cmd
+
+
+def test_sync_flags_output_edit_with_restored_mtime(tmp_path: Path, monkeypatch) -> None:
+    manifest, _, out_cmd = _synced_edit_with_restored_mtime(tmp_path, monkeypatch)
+
+    res = sync(target="claude", manifest_path=manifest)
+    assert res.conflicts == [str(out_cmd)]
+    assert out_cmd.read_text(encoding="utf-8") == "XY"
+
+
+def test_sync_clean_keeps_output_edit_with_restored_mtime(tmp_path: Path, monkeypatch) -> None:
+    manifest, src, out_cmd = _synced_edit_with_restored_mtime(tmp_path, monkeypatch)
+    src.unlink()
+
+    res = sync(target="claude", manifest_path=manifest, clean=True)
+    assert res.conflicts == [str(out_cmd)]
+    assert res.removed == []
+    assert out_cmd.read_text(encoding="utf-8") == "XY"
+
+
+def test_sync_outputs_do_not_share_inodes_across_targets(tmp_path: Path, monkeypatch) -> None:
+    manifest, src, out_claude = _init_project(tmp_path, monkeypatch)
+
+    sync(target="claude", manifest_path=manifest)
+    sync(target="amp", manifest_path=manifest)
+
+    out_amp = next((tmp_path / ".agents").rglob("workspace.hi.md"))
+    out_claude.write_text("user edit", encoding="utf-8")
+    assert out_amp.read_text(encoding="utf-8") == "hi"
+    assert src.read_text(encoding="utf-8") == "hi"
+
+
+def test_sync_treats_hardlinked_output_as_in_sync(tmp_path: Path, monkeypatch) -> None:
+    manifest, src, out_cmd = _init_project(tmp_path, monkeypatch)
+    out_cmd.parent.mkdir(parents=True)
+    os.link(src, out_cmd)
+
+    def _boom(desired_hash: str, dst: Path) -> bool:
+        raise AssertionError(f"unexpected compare of {dst}")
+
+    monkeypatch.setattr(sync_mod, "_files_differ", _boom)
+    res = sync(target="claude", manifest_path=manifest)
+    assert res.created == [] and res.updated == [] and res.conflicts == []
+
+
+def test_sync_picks_up_manifest_edits_within_one_process(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("BOTPACK_ROOT", str(tmp_path))
+    monkeypatch.setattr(paths_mod, "RACY_WINDOW_NS", 0)
+
+    manifest = tmp_path / "botpack.toml"
+    for ws in ("ws-one", "workspace-two"):
+        cmd_dir = tmp_path / ws / "commands"
+        cmd_dir.mkdir(parents=True)
+        (cmd_dir / f"{ws}.md").write_text(ws, encoding="utf-8")
+
+    manifest.write_text('version = 1\n\n[workspace]\ndir = "ws-one"\n', encoding="utf-8")
+    res1 = sync(target="claude", manifest_path=manifest)
+    assert [Path(p).name for p in res1.created] == ["workspace.ws-one.md"]
+
+    manifest.write_text('version = 1\n\n[workspace]\ndir = "workspace-two"\n', encoding="utf-8")
+    res2 = sync(target="claude", manifest_path=manifest)
+    assert [Path(p).name for p in res2.created] == ["workspace.workspace-two.md"]
+
+
+def test_load_sync_context_reuses_config_and_keeps_one_entry(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("BOTPACK_ROOT", str(tmp_path))
+    monkeypatch.setattr(paths_mod, "RACY_WINDOW_NS", 0)
+
+    manifests = []
+    for name in ("a", "b"):
+        d = tmp_path / name
+        d.mkdir()
+        (d / "botpack.toml").write_text('version = 1\n\n[workspace]\ndir = "ws"\n', encoding="utf-8")
+        manifests.append(d / "botpack.toml")
+
+    cfg1, ws1 = sync_mod._load_sync_context(manifests[0])
+    cfg2, ws2 = sync_mod._load_sync_context(manifests[0])
+    assert cfg2 is cfg1 and ws2 == ws1 == (tmp_path / "a" / "ws").resolve()
+
+    sync_mod._load_sync_context(manifests[1])
+    assert list(sync_mod._sync_context_cache) == [(manifests[1], manifests[1].parent)]
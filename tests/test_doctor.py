@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+import botpack.doctor as doctor_mod
+from botpack.doctor import run_doctor
+from botpack.store import sha256_is_accelerated
+
+_SLOW_SHA256 = "hashlib SHA-256 is not OpenSSL-backed; hashing and sync will be slow."
+
+
+def _manifest(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("BOTPACK_ROOT", str(tmp_path))
+    p = tmp_path / "botpack.toml"
+    p.write_text('version = 1\n\n[workspace]\ndir = ".botpack/workspace"\n', encoding="utf-8")
+    return p
+
+
+def test_doctor_warns_when_sha256_is_not_accelerated(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    manifest = _manifest(tmp_path, monkeypatch)
+    monkeypatch.setattr(doctor_mod, "sha256_is_accelerated", lambda: False)
+
+    res = run_doctor(manifest_path=manifest)
+    assert res.ok is True
+    assert _SLOW_SHA256 in res.warnings
+
+
+def test_doctor_is_quiet_when_sha256_is_accelerated(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    manifest = _manifest(tmp_path, monkeypatch)
+    monkeypatch.setattr(doctor_mod, "sha256_is_accelerated", lambda: True)
+
+    res = run_doctor(manifest_path=manifest)
+    assert _SLOW_SHA256 not in res.warnings
+
+
+def test_sha256_is_accelerated_detects_non_openssl_builds(monkeypatch: pytest.MonkeyPatch) -> None:
+    class _PortableSha256:  # stands in for CPython's builtin `_sha2` implementation
+        pass
+
+    monkeypatch.setattr(hashlib, "sha256", _PortableSha256)
+    assert sha256_is_accelerated() is False
+
+
+def test_sha256_is_accelerated_on_openssl_builds() -> None:
+    pytest.importorskip("_hashlib")
+    assert sha256_is_accelerated() is True
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 from botpack.cli import main
+from botpack.toml_write import toml_basic_string
 
 
 def test_botyard_toml_rewrite_is_deterministic_via_add_remove(tmp_path: Path, monkeypatch) -> None:
@@ -51,3 +53,8 @@ a = { path = "a" }
         '"c" = { path = "c" }\n'
     )
     assert manifest.read_text(encoding="utf-8") == expected_after_remove
+
+
+def test_toml_basic_string_escapes_like_json() -> None:
+    for s in ["", "@acme/x@1.0.0", 'a"b\\c', "\n\t\r\b\f", "\x00\x1f\x7f", "caf\u00e9 \u2603"]:
+        assert toml_basic_string(s) == json.dumps(s, ensure_ascii=False)
@@ -97,3 +97,23 @@ def test_pkgs_conflict_if_preexisting_unowned(tmp_path: Path, monkeypatch: pytes
     lock = _mk_lock(pkg_key="pkg@1.0.0", integrity=stored.digest)
     r = materialize_pkgs(lock=lock, mode="copy")
     assert r.conflicts
+
+
+def test_pkgs_materialize_symlink_is_idempotent(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("BOTPACK_ROOT", str(tmp_path))
+    monkeypatch.setenv("BOTPACK_STORE", str(tmp_path / "store" / "v1"))
+
+    src = tmp_path / "src"
+    src.mkdir(parents=True)
+    (src / "a.txt").write_text("a", encoding="utf-8")
+    stored = store_put_tree(src)
+
+    lock = _mk_lock(pkg_key="pkg@1.0.0", integrity=stored.digest)
+    r1 = materialize_pkgs(lock=lock, mode="symlink")
+    assert r1.created and r1.conflicts == []
+
+    dest = tmp_path / ".botpack" / "pkgs" / "pkg@1.0.0"
+    assert dest.is_symlink()
+
+    r2 = materialize_pkgs(lock=lock, mode="symlink")
+    assert r2.created == [] and r2.updated == [] and r2.conflicts == []
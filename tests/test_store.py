@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from botpack.store import store_materialize, store_put_tree, tree_digest
+import pytest
+
+from botpack.store import copy_range_fd, digest_algo, file_digest, store_materialize, store_put_tree, tree_digest
 
 
 def test_store_put_tree_is_content_addressed(tmp_path: Path, monkeypatch) -> None:
@@ -25,3 +27,100 @@ def test_store_put_tree_is_content_addressed(tmp_path: Path, monkeypatch) -> Non
     out = tmp_path / "out"
     store_materialize(t1, out, mode="copy")
     assert (out / "a.txt").read_text(encoding="utf-8") == "hello"
+
+
+def test_tree_digest_is_stable(tmp_path: Path) -> None:
+    # "a/b" must sort before "a-c" (component-wise), matching historical digests.
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a-c").mkdir()
+    (tmp_path / "a" / "b" / "f.txt").write_text("x", encoding="utf-8")
+    (tmp_path / "a-c" / "g").write_text("y", encoding="utf-8")
+    (tmp_path / "a.txt").write_text("z", encoding="utf-8")
+    (tmp_path / "link").symlink_to("a.txt")
+
+    assert tree_digest(tmp_path) == "sha256:973dd2985e942126761f5d1ca43c62afd20b9c324307c17a1de63ef0a70e3fbf"
+
+
+def test_store_put_tree_leaves_no_staging_dirs(tmp_path: Path, monkeypatch) -> None:
+    store = tmp_path / "store"
+    monkeypatch.setenv("BOTPACK_STORE", str(store))
+
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.txt").write_text("hello", encoding="utf-8")
+
+    t = store_put_tree(src)
+    assert [p.name for p in store.iterdir()] == [t.digest]
+
+
+def test_tree_digest_rejects_unknown_algo(tmp_path: Path) -> None:
+    assert digest_algo("sha256:abc") == "sha256"
+    with pytest.raises(ValueError):
+        digest_algo("md5:abc")
+    with pytest.raises(ValueError):
+        tree_digest(tmp_path, algo="md5")
+
+
+def test_store_put_tree_honors_digest_algo_override(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("BOTPACK_STORE", str(tmp_path / "store"))
+    monkeypatch.setenv("BOTPACK_DIGEST_ALGO", "sha256-v2")
+
+    src = tmp_path / "src"
+    (src / "d").mkdir(parents=True)
+    (src / "a.txt").write_text("hello", encoding="utf-8")
+    (src / "d" / "b.txt").write_text("world", encoding="utf-8")
+
+    t = store_put_tree(src)
+    assert t.digest.startswith("sha256-v2:")
+    assert digest_algo(t.digest) == "sha256-v2"
+    assert tree_digest(t.path, algo="sha256-v2") == t.digest
+    assert tree_digest(src, algo="sha256") != t.digest
+
+
+def test_store_put_tree_copies_modes_and_is_independent_of_src(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("BOTPACK_STORE", str(tmp_path / "store"))
+
+    src = tmp_path / "src"
+    (src / "scripts").mkdir(parents=True)
+    script = src / "scripts" / "run.py"
+    script.write_text("print('hi')\n", encoding="utf-8")
+    script.chmod(0o755)
+
+    t = store_put_tree(src)
+    stored = t.path / "scripts" / "run.py"
+    assert stored.stat().st_mode & 0o777 == 0o755
+    assert stored.stat().st_ino != script.stat().st_ino
+
+    script.write_text("print('edited')\n", encoding="utf-8")
+    assert tree_digest(t.path) == t.digest
+
+
+def test_copy_range_fd_reports_short_copies(tmp_path: Path, monkeypatch) -> None:
+    import os
+
+    if not hasattr(os, "copy_file_range"):
+        pytest.skip("copy_file_range not available")
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"x" * 4096)
+    with src.open("rb") as fin, (tmp_path / "dst.bin").open("wb") as fout:
+        assert copy_range_fd(fin.fileno(), fout.fileno()) is True
+    assert (tmp_path / "dst.bin").read_bytes() == src.read_bytes()
+
+    monkeypatch.setattr(os, "copy_file_range", lambda *args: 0, raising=False)
+    with src.open("rb") as fin, (tmp_path / "short.bin").open("wb") as fout:
+        assert copy_range_fd(fin.fileno(), fout.fileno()) is False
+
+
+@pytest.mark.parametrize("native", [True, False])
+def test_file_digest_matches_hashlib(tmp_path: Path, monkeypatch, native: bool) -> None:
+    import hashlib
+
+    import botpack.store as store_mod
+
+    if not native:
+        monkeypatch.setattr(store_mod, "_hashlib_file_digest", None)
+    for name, data in (("empty", b""), ("data", b"abc" * 1000)):
+        p = tmp_path / name
+        p.write_bytes(data)
+        with p.open("rb") as f:
+            assert file_digest(f, hashlib.sha256).hexdigest() == hashlib.sha256(data).hexdigest()
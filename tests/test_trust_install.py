@@ -4,6 +4,8 @@ import pytest
 from pathlib import Path
 
 from botpack.install import install
+from botpack.trust import TrustRequest, check_package_trust, check_trust_batch
+from botpack.trust_edit import trust_allow, trust_session
 
 
 def test_install_denies_untrusted_exec_packages(tmp_path: Path, monkeypatch) -> None:
@@ -49,3 +51,78 @@ allowMcp = false
 
     # Now it should succeed.
     install(manifest_path=tmp_path / "botpack.toml", lock_path=tmp_path / "botpack.lock")
+
+
+def test_trust_checks_see_trust_edits(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("BOTPACK_ROOT", str(tmp_path))
+
+    def decide() -> bool:
+        return check_package_trust(pkg_key="@acme/exec@1.0.0", integrity=None, needs_exec=True, needs_mcp=False).ok
+
+    assert decide() is False
+    trust_allow(tmp_path / ".botpack" / "trust.toml", pkg_key="@acme/exec@1.0.0", allow_exec=True)
+    assert decide() is True
+    assert decide() is True
+
+
+def test_trust_config_is_not_cached_while_racy(tmp_path: Path, monkeypatch) -> None:
+    import botpack.paths as paths_mod
+    import botpack.trust as trust_mod
+
+    monkeypatch.setenv("BOTPACK_ROOT", str(tmp_path))
+    trust = tmp_path / ".botpack" / "trust.toml"
+    trust.parent.mkdir(parents=True)
+    trust.write_text('version = 1\n\n["@acme/exec@1.0.0"]\nallowExec = false\n', encoding="utf-8")
+
+    def decide() -> bool:
+        return check_package_trust(pkg_key="@acme/exec@1.0.0", integrity=None, needs_exec=True, needs_mcp=False).ok
+
+    assert decide() is False
+    assert trust not in trust_mod._trust_cache
+    # A same-size external edit right after the check must still be seen.
+    trust.write_text('version = 1\n\n["@acme/exec@1.0.0"]\nallowExec = true \n', encoding="utf-8")
+    assert decide() is True
+
+    monkeypatch.setattr(paths_mod, "RACY_WINDOW_NS", 0)
+    assert decide() is True
+    assert trust in trust_mod._trust_cache
+
+
+def test_check_trust_batch_matches_single_checks(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("BOTPACK_ROOT", str(tmp_path))
+    trust = tmp_path / ".botpack" / "trust.toml"
+    trust_allow(trust, pkg_key="@acme/mcp@1.0.0", allow_mcp=True, integrity="sha256:aaa")
+
+    reqs = [
+        TrustRequest(pkg_key="@acme/mcp@1.0.0", integrity="sha256:aaa", needs_exec=False, needs_mcp=True, fqid="acme/a"),
+        TrustRequest(pkg_key="@acme/mcp@1.0.0", integrity="sha256:bbb", needs_exec=False, needs_mcp=True, fqid="acme/b"),
+        TrustRequest(pkg_key="@acme/mcp@1.0.0", integrity="sha256:aaa", needs_exec=True, needs_mcp=False),
+        TrustRequest(pkg_key="@acme/other@1.0.0", integrity=None, needs_exec=False, needs_mcp=False),
+    ]
+    decisions = check_trust_batch(reqs)
+    assert [d.ok for d in decisions] == [True, False, False, True]
+    assert "digest mismatch" in (decisions[1].reason or "")
+    assert decisions[2].reason == "@acme/mcp@1.0.0: exec not trusted"
+
+
+def test_trust_session_applies_several_edits_in_one_write(tmp_path: Path) -> None:
+    path = tmp_path / "trust.toml"
+    with trust_session(path) as t:
+        t.allow(pkg_key="@acme/a@1.0.0", allow_exec=True)
+        t.allow(pkg_key="@acme/b@1.0.0", allow_mcp=True, integrity="sha256:bbb")
+        assert not path.exists()
+    assert path.read_text(encoding="utf-8") == (
+        'version = 1\n\n["@acme/a@1.0.0"]\nallowExec = true\n\n["@acme/b@1.0.0"]\nallowMcp = true\n\n'
+        '["@acme/b@1.0.0".digest]\nintegrity = "sha256:bbb"\n'
+    )
+
+    with trust_session(path) as t:
+        assert t.revoke(pkg_key="@acme/a@1.0.0") is True
+        assert t.revoke(pkg_key="@acme/missing@1.0.0") is False
+    assert "@acme/a@1.0.0" not in path.read_text(encoding="utf-8")
+
+
+def test_trust_allow_dry_run_does_not_write(tmp_path: Path) -> None:
+    path = tmp_path / ".botpack" / "trust.toml"
+    trust_allow(path, pkg_key="@acme/a@1.0.0", allow_exec=True, dry_run=True)
+    assert not path.parent.exists()
@@ -267,3 +267,148 @@ args = ["hello"]
     assert '"workspace-ws-echo"' in out
     assert '"DIFFERENT"' in out
     assert '"mcp-magic-number"' in out
+
+
+def test_apply_amp_json_reapply_is_noop(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("BOTPACK_ROOT", str(tmp_path))
+    monkeypatch.setenv("BOTPACK_HOME_STATE_DIR", str(tmp_path / "state"))
+
+    cfg = tmp_path / "settings.json"
+    cfg.write_text('{"theme": "dark", "amp": {"foo": 1}}\n', encoding="utf-8")
+
+    res1 = apply_mcp_magic_number_home_config(tui="amp", path=cfg)
+    assert res1.ok is True
+    assert res1.changed is True
+    written = cfg.read_text(encoding="utf-8")
+
+    res2 = apply_mcp_magic_number_home_config(tui="amp", path=cfg)
+    assert res2.ok is True
+    assert res2.changed is False
+    assert cfg.read_text(encoding="utf-8") == written
+    assert '"theme": "dark"' in written
+
+
+def test_apply_noop_does_not_rewrite_state(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("BOTPACK_ROOT", str(tmp_path))
+    monkeypatch.setenv("BOTPACK_HOME_STATE_DIR", str(tmp_path / "state"))
+
+    for tui, name in (("codex", "config.toml"), ("amp", "settings.json")):
+        cfg = tmp_path / name
+        assert apply_mcp_magic_number_home_config(tui=tui, path=cfg).changed is True
+        state = tmp_path / "state" / "home-config.json"
+        ino = state.stat().st_ino
+
+        res = apply_mcp_magic_number_home_config(tui=tui, path=cfg)
+        assert res.ok is True
+        assert res.changed is False
+        assert state.stat().st_ino == ino
+
+
+def test_project_servers_are_reused_until_trust_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import botpack.mcp as mcp_mod
+    import botpack.paths as paths_mod
+
+    monkeypatch.setenv("BOTPACK_ROOT", str(tmp_path))
+    monkeypatch.setenv("BOTPACK_HOME_STATE_DIR", str(tmp_path / "state"))
+
+    (tmp_path / "botpack.toml").write_text('version = 1\n\n[workspace]\ndir = ".botpack/workspace"\n', encoding="utf-8")
+    trust = tmp_path / ".botpack" / "trust.toml"
+    trust.parent.mkdir(parents=True, exist_ok=True)
+    trust.write_text("version = 1\n\n[__workspace__]\nallowExec = true\nallowMcp = true\n", encoding="utf-8")
+    servers_toml = tmp_path / ".botpack" / "workspace" / "mcp" / "servers.toml"
+    servers_toml.parent.mkdir(parents=True, exist_ok=True)
+    servers_toml.write_text('version = 1\n\n[[server]]\nid = "ws-echo"\ncommand = "echo"\n', encoding="utf-8")
+    # Disable the racy window so the fresh inputs are eligible for caching.
+    monkeypatch.setattr(paths_mod, "RACY_WINDOW_NS", 0)
+
+    assert apply_mcp_magic_number_home_config(tui="codex", path=tmp_path / "config.toml").ok is True
+    assert "[mcp_servers.workspace-ws-echo]" in (tmp_path / "config.toml").read_text(encoding="utf-8")
+
+    def _boom(**kwargs: object) -> list:
+        raise AssertionError("unexpected servers.toml rebuild")
+
+    monkeypatch.setattr(mcp_mod, "build_mcp_servers", _boom)
+    res = apply_mcp_magic_number_home_config(tui="amp", path=tmp_path / "settings.json")
+    assert res.ok is True
+    assert '"workspace-ws-echo"' in (tmp_path / "settings.json").read_text(encoding="utf-8")
+
+    monkeypatch.undo()
+    monkeypatch.setenv("BOTPACK_ROOT", str(tmp_path))
+    monkeypatch.setenv("BOTPACK_HOME_STATE_DIR", str(tmp_path / "state"))
+    trust.write_text("version = 1\n", encoding="utf-8")
+    res = apply_mcp_magic_number_home_config(tui="coder", path=tmp_path / "code.toml")
+    assert res.ok is True
+    assert "untrusted" in res.message
+
+
+def test_project_servers_cache_keeps_one_entry_per_project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import botpack.paths as paths_mod
+    import botpack.tui.home_config as hc
+
+    monkeypatch.setenv("BOTPACK_ROOT", str(tmp_path))
+    monkeypatch.setenv("BOTPACK_HOME_STATE_DIR", str(tmp_path / "state"))
+    monkeypatch.setattr(paths_mod, "RACY_WINDOW_NS", 0)
+
+    (tmp_path / "botpack.toml").write_text('version = 1\n\n[workspace]\ndir = ".botpack/workspace"\n', encoding="utf-8")
+    trust = tmp_path / ".botpack" / "trust.toml"
+    trust.parent.mkdir(parents=True, exist_ok=True)
+    for i in range(3):
+        trust.write_text("version = 1\n" + "\n" * i, encoding="utf-8")
+        assert apply_mcp_magic_number_home_config(tui="codex", path=tmp_path / "config.toml").ok is True
+
+    entries = [k for k in hc._project_servers_cache if k[0] == paths_mod.work_root()]
+    assert len(entries) == 1
+
+
+def test_apply_amp_unchanged_rerun_skips_parsing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import botpack.tui.home_config as hc
+
+    monkeypatch.setenv("BOTPACK_ROOT", str(tmp_path))
+    monkeypatch.setenv("BOTPACK_HOME_STATE_DIR", str(tmp_path / "state"))
+
+    cfg = tmp_path / "settings.json"
+    assert apply_mcp_magic_number_home_config(tui="amp", path=cfg).changed is True
+
+    parsed: list[bytes] = []
+    real_loads = hc.loads_json
+
+    def _spy(raw: bytes) -> object:
+        parsed.append(raw)
+        return real_loads(raw)
+
+    with monkeypatch.context() as m:
+        m.setattr(hc, "loads_json", _spy)
+        res = apply_mcp_magic_number_home_config(tui="amp", path=cfg)
+        assert res.ok is True
+        assert res.changed is False
+    assert cfg.read_bytes() not in parsed
+
+    # Any byte change falls back to the full pass (and its drift detection).
+    cfg.write_text(cfg.read_text(encoding="utf-8").replace('"stdio"', '"http"'), encoding="utf-8")
+    res = apply_mcp_magic_number_home_config(tui="amp", path=cfg)
+    assert res.status == "conflict"
+
+
+def test_apply_codex_unchanged_rerun_skips_block_scan(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import botpack.tui.home_config as hc
+
+    monkeypatch.setenv("BOTPACK_ROOT", str(tmp_path))
+    monkeypatch.setenv("BOTPACK_HOME_STATE_DIR", str(tmp_path / "state"))
+
+    cfg = tmp_path / "config.toml"
+    cfg.write_text('model = "x"\r\n', encoding="utf-8", newline="")
+    assert apply_mcp_magic_number_home_config(tui="codex", path=cfg).changed is True
+
+    def _boom(text: str) -> tuple[None, None, None]:
+        raise AssertionError("unexpected managed-block scan")
+
+    with monkeypatch.context() as m:
+        m.setattr(hc, "_extract_managed_block", _boom)
+        res = apply_mcp_magic_number_home_config(tui="codex", path=cfg)
+        assert res.ok is True
+        assert res.changed is False
+
+    # With --force the full pass runs and still finds nothing to change.
+    res = apply_mcp_magic_number_home_config(tui="codex", path=cfg, force=True)
+    assert res.ok is True
+    assert res.changed is False
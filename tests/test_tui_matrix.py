@@ -3,6 +3,8 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+import pytest
+
 from botpack.tui.matrix import MatrixRun
 
 
@@ -19,3 +21,57 @@ def test_matrix_run_create_and_record(tmp_path: Path) -> None:
     data2 = json.loads(p.read_text(encoding="utf-8"))
     assert len(data2["entries"]) == 1
     assert data2["entries"][0]["status"] == "PASS"
+
+
+def test_matrix_run_append_defers_results_until_finalize(tmp_path: Path) -> None:
+    mr = MatrixRun.create(out_root=tmp_path / "dist")
+    p = mr.run_dir / "results.json"
+
+    mr.append(tui="codex", feature="a", status="PASS")
+    mr.append(tui="codex", feature="b", status="FAIL")
+    assert json.loads(p.read_text(encoding="utf-8"))["entries"] == []
+
+    mr.finalize()
+    entries = json.loads(p.read_text(encoding="utf-8"))["entries"]
+    assert [e["feature"] for e in entries] == ["a", "b"]
+    assert not (mr.run_dir / "entries.jsonl").exists()
+
+    mr.record(tui="codex", feature="c", status="PASS")
+    entries = json.loads(p.read_text(encoding="utf-8"))["entries"]
+    assert [e["feature"] for e in entries] == ["a", "b", "c"]
+
+
+def test_matrix_run_record_without_results_logs_nothing(tmp_path: Path) -> None:
+    mr = MatrixRun.load(tmp_path)
+
+    with pytest.raises(FileNotFoundError):
+        mr.record(tui="codex", feature="a", status="PASS")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_matrix_run_finalize_retry_does_not_reapply_entries(tmp_path: Path) -> None:
+    mr = MatrixRun.create(out_root=tmp_path / "dist")
+    p = mr.run_dir / "results.json"
+    mr.append(tui="codex", feature="a", status="PASS")
+    mr.finalize()
+
+    # Crash after results.json was replaced but before the merged log was removed.
+    token = json.loads(p.read_text(encoding="utf-8"))["merged_log"]
+    (mr.run_dir / f"entries.{token}.merging").write_text(
+        json.dumps({"tui": "codex", "feature": "a", "status": "PASS"}) + "\n", encoding="utf-8"
+    )
+    mr.record(tui="codex", feature="b", status="PASS")
+    entries = json.loads(p.read_text(encoding="utf-8"))["entries"]
+    assert [e["feature"] for e in entries] == ["a", "b"]
+    assert sorted(q.name for q in mr.run_dir.iterdir()) == ["results.json"]
+
+
+def test_matrix_run_finalize_merges_log_left_by_crash(tmp_path: Path) -> None:
+    mr = MatrixRun.create(out_root=tmp_path / "dist")
+    mr.append(tui="codex", feature="a", status="PASS")
+    # Crash after the log was renamed but before results.json was rewritten.
+    (mr.run_dir / "entries.jsonl").replace(mr.run_dir / "entries.deadbeef.merging")
+
+    mr.finalize()
+    entries = json.loads((mr.run_dir / "results.json").read_text(encoding="utf-8"))["entries"]
+    assert [e["feature"] for e in entries] == ["a"]